@@ -2,11 +2,11 @@
 OpsYield Analysis — Cost analysis and optimization engines.
 """
 
-from .cost_analyzer import CostAnalyzer
-from .waste_detector import WasteDetector
-from .idle_scoring import IdleScorer
-from .rightsizer import Rightsizer
-from .recommendations import RecommendationEngine
+from .cost_analyzer import CostAnalyzer, calculate_cost
+from .waste_detector import WasteDetector, detect_waste
+from .idle_scoring import IdleScorer, idle_score
+from .rightsizer import Rightsizer, rightsize
+from .recommendations import RecommendationEngine, build_recommendations
 from .savings import estimate_savings
 
 __all__ = [
@@ -14,6 +14,11 @@ __all__ = [
     "WasteDetector",
     "IdleScorer",
     "Rightsizer",
+    "rightsize",
     "RecommendationEngine",
     "estimate_savings",
+    "calculate_cost",
+    "detect_waste",
+    "idle_score",
+    "build_recommendations",
 ]
@@ -3,11 +3,13 @@ from typing import List
 from ..core.models import Resource
 
 
+def calculate_cost(resources: List[Resource]) -> float:
+    """Total 30-day cost of a list of Resource objects."""
+    return float(sum(r.cost_30d or 0.0 for r in resources))
+
+
 class CostAnalyzer:
     """Calculate total cost from a list of Resource objects."""
 
     def calculate(self, resources: List[Resource]) -> float:
-        total = 0.0
-        for r in resources:
-            total += r.cost_30d or 0.0
-        return total
+        return calculate_cost(resources)
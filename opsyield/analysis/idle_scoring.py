@@ -1,37 +1,51 @@
+import re
 from typing import Optional
 
 from ..core.models import Resource
 
+# Substring matches (no word boundaries): "mytestvm" and "dev_api" both count.
+_STOPPED_RE = re.compile(r"stop|terminated")
+_NONPROD_NAME_RE = re.compile(r"test|dev|tmp|temp", re.IGNORECASE)
 
-class IdleScorer:
 
-    def calculate_score(
-        self, resource: Resource, cpu_avg: Optional[float] = None
-    ) -> int:
-        score = 0
-        state = (resource.state or "").lower()
+def idle_score(resource: Resource, cpu_avg: Optional[float] = None) -> int:
+    """Heuristic 0-100 idleness score for a single resource."""
+    # Cheapest checks first; the name regex runs last and only if the
+    # score is not already saturated.
+    score = 0
+
+    # No external IP (often internal/test)
+    if not resource.external_ip:
+        score += 20
+
+    state = (resource.state or "").lower()
+
+    # Stopped instances with cost > 0
+    if (resource.cost_30d or 0) > 0 and _STOPPED_RE.search(state):
+        score += 50
 
-        # Stopped instances with cost > 0
-        if "stop" in state or "terminated" in state:
-            if (resource.cost_30d or 0) > 0:
-                score += 50
+    # Low CPU (if available)
+    effective_cpu = cpu_avg if cpu_avg is not None else resource.cpu_avg
+    if effective_cpu is not None and effective_cpu < 0.05 and "running" in state:
+        score += 50
 
-        # No external IP (often internal/test)
-        if not resource.external_ip:
-            score += 20
+    if score >= 100:
+        return 100
 
-        # Low CPU (if available)
-        effective_cpu = cpu_avg if cpu_avg is not None else resource.cpu_avg
-        if effective_cpu is not None and effective_cpu < 0.05 and "running" in state:
-            score += 50
+    # Long running non-prod (heuristic via creation_date)
+    # Note: days_running is not on Resource, but can be computed from creation_date
+    # For now, skip this heuristic unless extended.
 
-        # Long running non-prod (heuristic via creation_date)
-        # Note: days_running is not on Resource, but can be computed from creation_date
-        # For now, skip this heuristic unless extended.
+    # Keyword heuristics
+    if resource.name and _NONPROD_NAME_RE.search(resource.name):
+        score += 20
 
-        # Keyword heuristics
-        name = (resource.name or "").lower()
-        if any(x in name for x in ["test", "dev", "tmp", "temp"]):
-            score += 20
+    return min(100, score)
 
-        return min(100, score)
+
+class IdleScorer:
+
+    def calculate_score(
+        self, resource: Resource, cpu_avg: Optional[float] = None
+    ) -> int:
+        return idle_score(resource, cpu_avg)
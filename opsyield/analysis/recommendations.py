@@ -3,6 +3,23 @@ from typing import List, Optional
 from ..core.models import Resource
 
 
+def build_recommendations(
+    idle_score: int, suggestion: Optional[str], savings: float
+) -> List[str]:
+    """Human-readable actions for one resource's idle score and rightsize hint."""
+    recommendations = []
+
+    if idle_score >= 70:
+        recommendations.append("Consider stopping this instance")
+
+    if suggestion:
+        recommendations.append(
+            f"Downsize to {suggestion} to save approx ${savings}/month"
+        )
+
+    return recommendations
+
+
 class RecommendationEngine:
 
     def build(
@@ -12,15 +29,4 @@ class RecommendationEngine:
         suggestion: Optional[str],
         savings: float,
     ) -> List[str]:
-
-        recommendations = []
-
-        if idle_score >= 70:
-            recommendations.append("Consider stopping this instance")
-
-        if suggestion:
-            recommendations.append(
-                f"Downsize to {suggestion} to save approx ${savings}/month"
-            )
-
-        return recommendations
+        return build_recommendations(idle_score, suggestion, savings)
@@ -8,14 +8,24 @@ RIGHTSIZE_MAP = {
 }
 
 
+# Only clearly under-used instances are downsized.
+RIGHTSIZE_CPU_THRESHOLD = 0.20
+
+
+def rightsize(cpu_avg: Optional[float], class_type: Optional[str]) -> Optional[str]:
+    """
+    Suggest a smaller instance type if CPU utilization is low.
+
+    Takes plain values rather than a Resource so batch callers can read the
+    attributes once and skip method dispatch per resource.
+    """
+    if cpu_avg is not None and cpu_avg < RIGHTSIZE_CPU_THRESHOLD and class_type:
+        return RIGHTSIZE_MAP.get(class_type)
+    return None
+
+
 class Rightsizer:
 
     def suggest(self, resource: Resource) -> Optional[str]:
         """Suggest a smaller instance type if CPU utilization is low."""
-        cpu_avg = resource.cpu_avg
-        instance_type = resource.class_type
-
-        if cpu_avg is not None and cpu_avg < 0.20 and instance_type:
-            return RIGHTSIZE_MAP.get(instance_type)
-
-        return None
+        return rightsize(resource.cpu_avg, resource.class_type)
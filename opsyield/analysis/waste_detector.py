@@ -1,49 +1,66 @@
+import re
+import time
 from typing import List, Dict, Any
-from datetime import datetime, timezone
 
 from ..core.models import Resource
 
+# Substring matches (no word boundaries): "tmpvm" and "load_test" both count.
+_STOPPED_RE = re.compile(r"stop|terminated")
+_TEMP_NAME_RE = re.compile(r"tmp|temp|test|poc", re.IGNORECASE)
 
-class WasteDetector:
+MAX_RUNTIME_DAYS = 14  # Lowered threshold for warning
 
-    MAX_RUNTIME_DAYS = 14  # Lowered threshold for warning
 
-    def detect(self, resources: List[Resource]) -> List[Dict[str, Any]]:
-        waste = []
-        now = datetime.now(timezone.utc)
-
-        for r in resources:
-            reasons = []
-            name = (r.name or "").lower()
-            state = (r.state or "").lower()
-            cost = r.cost_30d or 0
-
-            # 1. Stopped but costing money (Zombie resources)
-            if ("stop" in state or "terminated" in state) and cost > 1.0:
-                reasons.append(f"Stopped but incurring cost (${cost:.2f})")
-
-            # 2. Old temporary resources
-            created_at = r.creation_date
-            if created_at:
-                days_running = (now - created_at).days
-                if days_running > self.MAX_RUNTIME_DAYS:
-                    if any(x in name for x in ["tmp", "temp", "test", "poc"]):
-                        reasons.append(
-                            f"Temporary resource running for {days_running} days"
-                        )
-
-            # 3. Orphaned IPs
-            if r.type == "ip_address" and state == "reserved":
-                reasons.append("Unattached IP address")
-
-            if reasons:
-                waste.append(
-                    {
-                        "name": r.name,
-                        "type": r.type or "unknown",
-                        "reasons": reasons,
-                        "cost_30d": cost,
-                    }
+def detect_waste(
+    resources: List[Resource], max_runtime_days: int = MAX_RUNTIME_DAYS
+) -> List[Dict[str, Any]]:
+    """Flag zombie, long-lived temporary and orphaned resources."""
+    waste = []
+    # Compare epoch floats: no timedelta per row, and naive/aware
+    # creation dates can be mixed without raising.
+    now_ts = time.time()
+    # whole days running > max_runtime_days  <=>  created_ts <= threshold_ts
+    threshold_ts = now_ts - (max_runtime_days + 1) * 86400
+
+    for r in resources:
+        reasons = []
+        state = (r.state or "").lower()
+        cost = r.cost_30d or 0
+
+        # 1. Stopped but costing money (Zombie resources)
+        if cost > 1.0 and _STOPPED_RE.search(state):
+            reasons.append(f"Stopped but incurring cost (${cost:.2f})")
+
+        # 2. Old temporary resources
+        created_at = r.creation_date
+        if created_at and r.name and _TEMP_NAME_RE.search(r.name):
+            created_ts = created_at.timestamp()
+            if created_ts <= threshold_ts:
+                days_running = int((now_ts - created_ts) // 86400)
+                reasons.append(
+                    f"Temporary resource running for {days_running} days"
                 )
 
-        return waste
+        # 3. Orphaned IPs
+        if r.type == "ip_address" and state == "reserved":
+            reasons.append("Unattached IP address")
+
+        if reasons:
+            waste.append(
+                {
+                    "name": r.name,
+                    "type": r.type or "unknown",
+                    "reasons": reasons,
+                    "cost_30d": cost,
+                }
+            )
+
+    return waste
+
+
+class WasteDetector:
+
+    MAX_RUNTIME_DAYS = MAX_RUNTIME_DAYS
+
+    def detect(self, resources: List[Resource]) -> List[Dict[str, Any]]:
+        return detect_waste(resources, self.MAX_RUNTIME_DAYS)
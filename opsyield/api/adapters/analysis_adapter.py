@@ -2,6 +2,7 @@ from typing import Dict, Any
 from dataclasses import asdict
 from opsyield.core.models import AnalysisResult
 from opsyield.core.logging import get_logger
+from opsyield.utils.helpers import json_dumps_str
 
 logger = get_logger(__name__)
 
@@ -38,6 +39,15 @@ def adapt_analysis_result(result: AnalysisResult) -> Dict[str, Any]:
     # We will preserve the summary as 'trends_summary' just in case.
     trends_summary = data.get("trends", {})
 
+    # Per-row amounts are kept unrounded through analysis/aggregation and
+    # rounded once here, for presentation.
+    for row in daily_trends:
+        if isinstance(row.get("amount"), float):
+            row["amount"] = round(row["amount"], 4)
+    for row in data.get("cost_drivers") or []:
+        if isinstance(row.get("cost"), float):
+            row["cost"] = round(row["cost"], 4)
+
     data["trends"] = daily_trends
     data["trends_summary"] = trends_summary
 
@@ -75,3 +85,11 @@ def adapt_analysis_result(result: AnalysisResult) -> Dict[str, Any]:
         data["forecast"] = []
 
     return data
+
+
+def analysis_result_json(result: AnalysisResult) -> str:
+    """
+    Adapt and serialize an AnalysisResult as the JSON string MCP tools return.
+    Shared by the stdio and SSE servers; uses orjson when installed.
+    """
+    return json_dumps_str(adapt_analysis_result(result), default=str)
@@ -3,15 +3,37 @@ OpsYield API Entrypoint
 Only responsible for starting the server.
 """
 
+import os
+import sys
+from importlib.util import find_spec
+
 import uvicorn
 
 
+def _server_options() -> dict:
+    """
+    Prefer uvloop + httptools (shipped with uvicorn[standard]) where they
+    are available; uvloop does not support Windows.
+
+    Workers default to 1: billing/analysis caches and token refresh
+    coalescing are per process, so extra workers multiply upstream
+    BigQuery/Cost Explorer calls. Raise OPSYIELD_API_WORKERS for CPU-bound load.
+    """
+    use_uvloop = sys.platform != "win32" and find_spec("uvloop") is not None
+    return {
+        "loop": "uvloop" if use_uvloop else "asyncio",
+        "http": "httptools" if find_spec("httptools") is not None else "h11",
+        "workers": int(os.environ.get("OPSYIELD_API_WORKERS", "1")),
+    }
+
+
 def main():
     uvicorn.run(
         "opsyield.api.server:app",
         host="0.0.0.0",
         port=8000,
         reload=False,
+        **_server_options(),
     )
 
 
@@ -8,10 +8,12 @@ from enum import Enum
 
 from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import uuid
 
 from ..core.orchestrator import Orchestrator
 from ..core.logging import (
+    configure_logging,
     get_logger,
     set_correlation_id,
     get_correlation_id,
@@ -19,8 +21,10 @@ from ..core.logging import (
 )
 from ..core.config import validate_environment
 from ..providers.factory import ProviderFactory
+from ..utils.helpers import json_dumps
 from .adapters.analysis_adapter import adapt_analysis_result
 
+configure_logging()
 logger = get_logger(__name__)
 _orchestrator = Orchestrator()
 
@@ -40,10 +44,22 @@ class Provider(str, Enum):
 # App Definition
 # ─────────────────────────────────────────────
 
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when available. Analysis payloads
+    (resources, daily trends) are large dicts, where this is several times
+    faster than the stdlib encoder. FastAPI's ORJSONResponse is deprecated.
+    """
+
+    def render(self, content) -> bytes:
+        return json_dumps(content)
+
+
 app = FastAPI(
     title="OpsYield API",
     version="0.2.0",
     description="Internal multi-cloud FinOps API",
+    default_response_class=FastJSONResponse,
 )
 
 app.add_middleware(
@@ -77,7 +93,8 @@ async def request_tracing_middleware(request: Request, call_next):
 
 
 @app.get("/api/health")
-def health_check():
+async def health_check():
+    # async with no awaits: served on the event loop, no threadpool hop
     return {"status": "ok", "version": "0.2.0"}
 
 
@@ -1,5 +1,7 @@
-from typing import List
+from typing import Dict, List
 from datetime import datetime, timedelta
+import os
+import threading
 import boto3
 from .base import BillingProvider
 from ..core.models import NormalizedCost
@@ -7,6 +9,34 @@ from ..core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Env vars that select the credentials boto3 resolves (same set as
+# cli_utils._IDENTITY_ENV["aws"]); part of every client and cache key so a
+# profile/key switch never reuses another account's client or costs.
+_CREDENTIAL_ENV = ("AWS_PROFILE", "AWS_ACCESS_KEY_ID")
+
+
+def _credential_key() -> tuple:
+    return tuple(os.environ.get(k) for k in _CREDENTIAL_ENV)
+
+
+# boto3 clients are thread-safe; reusing one per (region, credentials) keeps
+# its HTTPS connection pool warm across queries. Session creation is not,
+# hence the lock.
+_CE_CLIENTS: Dict[tuple, object] = {}
+_CE_LOCK = threading.Lock()
+
+
+def _get_ce_client(region: str):
+    key = (region, _credential_key())
+    client = _CE_CLIENTS.get(key)
+    if client is None:
+        with _CE_LOCK:
+            client = _CE_CLIENTS.get(key)
+            if client is None:
+                client = boto3.Session(region_name=region).client("ce")
+                _CE_CLIENTS[key] = client
+    return client
+
 
 class AWSBillingProvider(BillingProvider):
     def __init__(self, use_cur: bool = False, region: str = "us-east-1"):
@@ -23,43 +53,52 @@ class AWSBillingProvider(BillingProvider):
                 "AWS CUR implementation pending configuration. Falling back to Cost Explorer."
             )
 
-        return await asyncio.to_thread(self._get_ce_costs, days)
+        return await self._cached_costs(
+            ("aws", self.region, _credential_key(), days),
+            lambda: asyncio.to_thread(self._get_ce_costs, days),
+        )
 
     def _get_ce_costs(self, days: int) -> List[NormalizedCost]:
         costs = []
         try:
-            session = boto3.Session(region_name=self.region)
-            ce = session.client("ce")
+            ce = _get_ce_client(self.region)
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
 
-            response = ce.get_cost_and_usage(
-                TimePeriod={
+            # DAILY buckets feed daily_trends/forecasting, so they stay; CE
+            # paginates grouped daily results, so follow NextPageToken.
+            request = {
+                "TimePeriod": {
                     "Start": start_date.strftime("%Y-%m-%d"),
                     "End": end_date.strftime("%Y-%m-%d"),
                 },
-                Granularity="DAILY",
-                Metrics=["UnblendedCost"],
-                GroupBy=[{"Type": "DIMENSION", "Key": "SERVICE"}],
-            )
-
-            for rbt in response.get("ResultsByTime", []):
-                dt = datetime.strptime(rbt["TimePeriod"]["Start"], "%Y-%m-%d")
-                for group in rbt.get("Groups", []):
-                    amount = float(group["Metrics"]["UnblendedCost"]["Amount"])
-                    if amount > 0.001:
-                        costs.append(
-                            NormalizedCost(
-                                provider="aws",
-                                service=group["Keys"][0],
-                                region=self.region,
-                                resource_id="aggregated",
-                                cost=round(amount, 4),
-                                currency="USD",
-                                timestamp=dt,
-                                tags={},
+                "Granularity": "DAILY",
+                "Metrics": ["UnblendedCost"],
+                "GroupBy": [{"Type": "DIMENSION", "Key": "SERVICE"}],
+            }
+            while True:
+                response = ce.get_cost_and_usage(**request)
+                for rbt in response.get("ResultsByTime", []):
+                    dt = datetime.strptime(rbt["TimePeriod"]["Start"], "%Y-%m-%d")
+                    for group in rbt.get("Groups", []):
+                        amount = float(group["Metrics"]["UnblendedCost"]["Amount"])
+                        if amount > 0.001:
+                            costs.append(
+                                NormalizedCost(
+                                    provider="aws",
+                                    service=group["Keys"][0],
+                                    region=self.region,
+                                    resource_id="aggregated",
+                                    cost=round(amount, 4),
+                                    currency="USD",
+                                    timestamp=dt,
+                                    tags={},
+                                )
                             )
-                        )
+                token = response.get("NextPageToken")
+                if not token:
+                    break
+                request["NextPageToken"] = token
         except Exception as e:
             logger.error(f"AWS Cost Explorer failed: {e}")
         return costs
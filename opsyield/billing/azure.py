@@ -1,6 +1,7 @@
 from typing import List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import asyncio
+import threading
 from .base import BillingProvider
 from ..core.models import NormalizedCost
 from ..core.logging import get_logger
@@ -9,22 +10,56 @@ import os
 
 logger = get_logger(__name__)
 
+# Process-wide credential and Cost Management client, built on first use.
+# The credential caches its access token and the client keeps its HTTPS
+# session, so reusing them avoids an OAuth round-trip + TLS setup per query.
+_CLIENT_LOCK = threading.Lock()
+_AZURE_CREDENTIAL = None
+_COST_CLIENT = None
+
+
+def _get_credential() -> DefaultAzureCredential:
+    global _AZURE_CREDENTIAL
+    if _AZURE_CREDENTIAL is None:
+        with _CLIENT_LOCK:
+            if _AZURE_CREDENTIAL is None:
+                _AZURE_CREDENTIAL = DefaultAzureCredential()
+    return _AZURE_CREDENTIAL
+
+
+def _get_cost_client():
+    """Shared CostManagementClient (scope is passed per query, not per client)."""
+    global _COST_CLIENT
+    if _COST_CLIENT is None:
+        from azure.mgmt.costmanagement import CostManagementClient
+
+        credential = _get_credential()
+        with _CLIENT_LOCK:
+            if _COST_CLIENT is None:
+                _COST_CLIENT = CostManagementClient(credential)
+    return _COST_CLIENT
+
 
 class AzureBillingProvider(BillingProvider):
     def __init__(self, subscription_id: str = None):
-        self.credential = DefaultAzureCredential()
         self.subscription_id = subscription_id or os.environ.get(
             "AZURE_SUBSCRIPTION_ID"
         )
 
+    @property
+    def credential(self) -> DefaultAzureCredential:
+        return _get_credential()
+
     async def get_costs(self, days: int = 30) -> List[NormalizedCost]:
-        return await asyncio.to_thread(self._get_costs_sync, days)
+        return await self._cached_costs(
+            ("azure", self.subscription_id, days),
+            lambda: asyncio.to_thread(self._get_costs_sync, days),
+        )
 
     def _get_costs_sync(self, days: int) -> List[NormalizedCost]:
         costs = []
         try:
             # Requires azure-mgmt-costmanagement
-            from azure.mgmt.costmanagement import CostManagementClient
             from azure.mgmt.costmanagement.models import (
                 QueryDefinition,
                 QueryTimePeriod,
@@ -36,10 +71,10 @@ class AzureBillingProvider(BillingProvider):
             if not self.subscription_id:
                 raise ValueError("AZURE_SUBSCRIPTION_ID is not set")
 
-            client = CostManagementClient(self.credential)
+            client = _get_cost_client()
             scope = f"/subscriptions/{self.subscription_id}"
 
-            end = datetime.now()
+            end = datetime.now(timezone.utc)
             start = end - timedelta(days=days)
 
             # Query definition
@@ -78,11 +113,15 @@ class AzureBillingProvider(BillingProvider):
 
                 if isinstance(dt_val, int):
                     # 20230101
-                    ts = datetime.strptime(str(dt_val), "%Y%m%d")
+                    ts = datetime.strptime(str(dt_val), "%Y%m%d").replace(
+                        tzinfo=timezone.utc
+                    )
                 elif isinstance(dt_val, str):
                     ts = datetime.fromisoformat(dt_val)
+                    if ts.tzinfo is None:
+                        ts = ts.replace(tzinfo=timezone.utc)
                 else:
-                    ts = datetime.now()
+                    ts = end
 
                 costs.append(
                     NormalizedCost(
@@ -1,6 +1,12 @@
+import os
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Awaitable, Callable, Hashable, List
 from ..core.models import NormalizedCost
+from ..utils.cache import TTLCache
+
+# Shared across providers/instances: cost queries are slow (seconds) and,
+# for BigQuery, billed per scan. Keyed by (provider, project/sub, days).
+_COST_CACHE = TTLCache(ttl=float(os.environ.get("OPSYIELD_COST_CACHE_TTL", "600")))
 
 
 class BillingProvider(ABC):
@@ -10,3 +16,14 @@ class BillingProvider(ABC):
         Fetch cost data normalized to the unified schema.
         """
         pass
+
+    async def _cached_costs(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[List[NormalizedCost]]],
+    ) -> List[NormalizedCost]:
+        """
+        Serve costs from the shared TTL cache, coalescing concurrent
+        identical queries. Empty results (failed queries) are not cached.
+        """
+        return await _COST_CACHE.get_or_compute(key, fetch, should_cache=bool)
@@ -1,16 +1,30 @@
-from typing import List
-from datetime import datetime, timedelta
-from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 import asyncio
-import concurrent.futures
+import functools
+import hashlib
+import json
+import re
+import threading
+import time
+import weakref
+import httpx
 from .base import BillingProvider
 from ..core.models import NormalizedCost
 from ..core.logging import get_logger
+from ..utils.helpers import json_loads
 import os
 
 logger = get_logger(__name__)
 
 
+def _adc_paths() -> List[str]:
+    return [
+        os.path.expanduser("~/.config/gcloud/application_default_credentials.json"),
+        os.path.join(os.environ.get("APPDATA", ""), "gcloud", "application_default_credentials.json"),
+    ]
+
+
 def _load_credentials():
     """
     Load GCP credentials, bypassing the GCE metadata server probe that can
@@ -21,7 +35,6 @@ def _load_credentials():
       2. ADC file (~/.config/gcloud/application_default_credentials.json)
       3. Fallback to google.auth.default() with GCE disabled
     """
-    import json
     from google.auth.transport.requests import Request as GoogleAuthRequest
 
     # 1. Service account key file
@@ -35,11 +48,7 @@ def _load_credentials():
         return creds
 
     # 2. ADC authorized_user file (gcloud auth application-default login)
-    adc_paths = [
-        os.path.expanduser("~/.config/gcloud/application_default_credentials.json"),
-        os.path.join(os.environ.get("APPDATA", ""), "gcloud", "application_default_credentials.json"),
-    ]
-    for adc_path in adc_paths:
+    for adc_path in _adc_paths():
         if os.path.exists(adc_path):
             try:
                 with open(adc_path) as f:
@@ -68,13 +77,318 @@ def _load_credentials():
     return creds
 
 
-# Shared executor — limits BQ threads and allows daemon shutdown
-_BQ_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="bq")
+_FileStamp = Tuple[Optional[str], Optional[int]]
+
+
+def _credentials_cache_key() -> Tuple[_FileStamp, ...]:
+    """(path, mtime) for every credential file _load_credentials() may read."""
+    key: List[_FileStamp] = []
+    for path in [os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"), *_adc_paths()]:
+        try:
+            key.append((path, os.stat(path).st_mtime_ns) if path else (None, None))
+        except OSError:
+            key.append((path, None))
+    return tuple(key)
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_credentials(_key: tuple):
+    return _load_credentials()
+
+
+def _get_credentials():
+    """
+    Return the process-wide credentials object.
+
+    Parsing a service-account key (PEM + scope validation) or an ADC file
+    happens once; later token refreshes reuse the same object. Rotating or
+    replacing a key file changes its mtime and rebuilds the credentials.
+    """
+    return _cached_credentials(_credentials_cache_key())
+
+
+class TokenCache:
+    """
+    Process-wide bearer token cache.
+
+    Reads are lock-free: (token, expiry) is stored as one tuple, so a reader
+    always sees a consistent pair. Writers take a lock, and misses are
+    refreshed by one thread at a time so concurrent callers trigger a
+    single OAuth exchange instead of one each. Async callers coalesce on an
+    in-flight refresh task per event loop (see get_or_refresh_async).
+    """
+
+    def __init__(self, skew_s: float = 300.0):
+        # Treat tokens as expired this many seconds early so a request never
+        # goes out with a token that lapses in flight.
+        self.skew_s = skew_s
+        self._entry: Tuple[Optional[str], float] = (None, 0.0)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        # loop -> that loop's in-flight refresh task. Keyed per loop because
+        # asyncio tasks are loop-bound.
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Task]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get_valid_token(self) -> Optional[str]:
+        token, expiry = self._entry  # single reference read, no lock needed
+        if token and time.time() < expiry:
+            return token
+        return None
+
+    def set_token(self, token: str, expiry_ts: float) -> None:
+        with self._lock:
+            self._entry = (token, expiry_ts - self.skew_s)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entry = (None, 0.0)
+
+    def get_or_refresh(self, fetch: Callable[[], Tuple[str, float]]) -> str:
+        """Return the cached token, or call fetch() -> (token, expiry_ts) once."""
+        token = self.get_valid_token()
+        if token:
+            return token
+        with self._refresh_lock:
+            token = self.get_valid_token()
+            if token:
+                return token
+            token, expiry_ts = fetch()
+            self.set_token(token, expiry_ts)
+            return token
+
+    async def get_or_refresh_async(self, fetch: Callable[[], Tuple[str, float]]) -> str:
+        """
+        Async get_or_refresh(): a valid token is returned without leaving the
+        loop. On a miss, the first coroutine runs fetch() in a worker thread
+        and the rest await its result (or its error) instead of issuing their
+        own refresh.
+        """
+        token = self.get_valid_token()
+        if token:
+            return token
+
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(loop)
+        if inflight is None:
+            inflight = self._inflight[loop] = loop.create_task(
+                asyncio.to_thread(self.get_or_refresh, fetch)
+            )
+            inflight.add_done_callback(lambda _t: self._inflight.pop(loop, None))
+        # shield: a cancelled caller must not cancel the refresh others await.
+        return await asyncio.shield(inflight)
+
+
+_GCP_TOKEN_CACHE = TokenCache()
+
+# Used when google.auth does not report an expiry (access tokens live ~1h).
+_DEFAULT_TOKEN_LIFETIME_S = 3600
+
+
+def _expiry_epoch(creds) -> float:
+    """Epoch seconds at which creds.token expires (google.auth uses naive UTC)."""
+    expiry = getattr(creds, "expiry", None)
+    if expiry is None:
+        return time.time() + _DEFAULT_TOKEN_LIFETIME_S
+    if expiry.tzinfo is None:
+        expiry = expiry.replace(tzinfo=timezone.utc)
+    return expiry.timestamp()
+
+
+def _token_cache_path() -> Optional[str]:
+    """
+    On-disk token cache location, from OPSYIELD_GCP_TOKEN_CACHE; off unless
+    set, as the file holds a live bearer token. Lets short-lived MCP
+    processes skip the OAuth exchange on start-up.
+    """
+    path = os.environ.get("OPSYIELD_GCP_TOKEN_CACHE")
+    return os.path.expanduser(path) if path else None
+
+
+def _credentials_fingerprint() -> str:
+    """Identifies the credential source, so a token is never reused across accounts."""
+    return hashlib.sha256(repr(_credentials_cache_key()).encode()).hexdigest()
+
+
+def _load_token_file(path: str, source: str) -> Optional[Tuple[str, float]]:
+    """Return (token, expiry_epoch) from disk if it matches `source` and is fresh."""
+    try:
+        with open(path) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    token, expiry = entry.get("token"), entry.get("expiry", 0)
+    if entry.get("source") != source or not token:
+        return None
+    if time.time() >= expiry - _GCP_TOKEN_CACHE.skew_s:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    return token, float(expiry)
+
+
+def _save_token_file(path: str, source: str, token: str, expiry: float) -> None:
+    """Atomically write the token with owner-only permissions (0600)."""
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"source": source, "token": token, "expiry": expiry}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug(f"Could not persist GCP token cache to {path}: {e}")
+
+
+def _refresh_gcp_token() -> Tuple[str, float]:
+    """
+    Return (token, expiry_epoch), from the on-disk cache if still fresh,
+    otherwise by loading/refreshing credentials. Blocking.
+    """
+    path = _token_cache_path()
+    source = _credentials_fingerprint() if path else ""
+    if path:
+        cached = _load_token_file(path, source)
+        if cached:
+            return cached
+
+    from google.auth.transport.requests import Request as GoogleAuthRequest
+
+    creds = _get_credentials()
+    if not creds.valid:
+        creds.refresh(GoogleAuthRequest())
+    token, expiry = creds.token, _expiry_epoch(creds)
+    if path:
+        _save_token_file(path, source, token, expiry)
+    return token, expiry
+
+
+def _get_gcp_token() -> str:
+    """
+    Return a valid OAuth2 bearer token for the BigQuery REST API.
+
+    Served from _GCP_TOKEN_CACHE until shortly before expiry; only a miss
+    touches google.auth. Blocking on a miss — call via asyncio.to_thread().
+    """
+    return _GCP_TOKEN_CACHE.get_or_refresh(_refresh_gcp_token)
+
+
+async def _get_gcp_token_async() -> str:
+    """
+    Async variant of _get_gcp_token() for use on the event loop.
+
+    Concurrent coroutines on a cold cache share one blocking google.auth
+    refresh (run in a worker thread) instead of each starting their own.
+    """
+    return await _GCP_TOKEN_CACHE.get_or_refresh_async(_refresh_gcp_token)
+
+
+_BQ_QUERY_URL = "https://bigquery.googleapis.com/bigquery/v2/projects/{project}/queries"
 
 # Hard wall-clock budget for the entire BQ call (submit + wait for results).
 # MCP server environment can be slow on first BQ slot allocation (~20-25s cold).
 _BQ_TIMEOUT_S = 55
 
+# Per-HTTP-request timeout; asyncio.wait_for(_BQ_TIMEOUT_S) is the real guard.
+_BQ_HTTP_TIMEOUT_S = 30
+
+# getQueryResults long-polls server-side for up to this long per request.
+_BQ_POLL_TIMEOUT_MS = 5000
+_BQ_POLL_INTERVAL_S = 0.5
+
+
+def _parse_query_rows(data: dict) -> List[dict]:
+    """
+    Flatten a BigQuery REST response ({schema, rows: [{f: [{v}]}]}) into
+    a list of {column_name: raw_value} dicts.
+    """
+    fields = [f["name"] for f in data.get("schema", {}).get("fields", [])]
+    return [
+        {name: cell.get("v") for name, cell in zip(fields, row.get("f", []))}
+        for row in data.get("rows", [])
+    ]
+
+
+async def _run_bq_query(client: httpx.AsyncClient, project: str, payload: dict) -> dict:
+    """
+    Submit a query via jobs.query without blocking on completion, then poll
+    jobs.getQueryResults until the job finishes.
+
+    Large billing scans routinely outlive a single synchronous jobs.query
+    call (jobComplete=false, no rows), so the wait happens here instead.
+    Rows from every result page are merged under "rows".
+    """
+    url = _BQ_QUERY_URL.format(project=project)
+    resp = await client.post(url, json={**payload, "timeoutMs": 0})
+    resp.raise_for_status()
+    data = json_loads(resp.content)
+
+    job_ref = data.get("jobReference", {})
+    results_url = f"{url}/{job_ref.get('jobId')}"
+    params: Dict[str, str] = {
+        "timeoutMs": str(_BQ_POLL_TIMEOUT_MS),
+        "formatOptions.useInt64Timestamp": "true",
+    }
+    if job_ref.get("location"):
+        params["location"] = job_ref["location"]
+
+    while not data.get("jobComplete", False):
+        await asyncio.sleep(_BQ_POLL_INTERVAL_S)
+        resp = await client.get(results_url, params=params)
+        resp.raise_for_status()
+        data = json_loads(resp.content)
+
+    rows = data.get("rows", [])
+    page_token = data.get("pageToken")
+    while page_token:
+        resp = await client.get(results_url, params={**params, "pageToken": page_token})
+        resp.raise_for_status()
+        page = json_loads(resp.content)
+        rows.extend(page.get("rows", []))
+        page_token = page.get("pageToken")
+    data["rows"] = rows
+    return data
+
+
+# _TABLE_SUFFIX only works on date-sharded tables (suffix = YYYYMMDD).
+# Billing exports use billing-account-ID suffixes, so filter by usage_start_time only.
+_COST_QUERY_TEMPLATE = """
+    SELECT
+        service.description    AS service_name,
+        currency               AS currency,
+        SUM(cost)              AS total_cost,
+        MIN(usage_start_time)  AS usage_timestamp
+    FROM `{project}.{dataset}.{table}`
+    WHERE
+        DATE(usage_start_time) >= @start_date
+        AND cost > 0
+    GROUP BY
+        service_name, currency
+    ORDER BY
+        total_cost DESC
+"""
+
+# Table names cannot be query parameters, so the project ID is interpolated;
+# restrict it to characters valid in (domain-scoped) GCP project IDs.
+_PROJECT_ID_RE = re.compile(r"^[a-z0-9][a-z0-9.:-]*$")
+
+
+def validate_project_id(project: str) -> str:
+    """Return project unchanged, or raise ValueError if unsafe to put in SQL."""
+    if not _PROJECT_ID_RE.match(project):
+        raise ValueError(f"Invalid GCP project ID: {project!r}")
+    return project
+
+
+@functools.lru_cache(maxsize=64)
+def _cost_query(project: str, dataset: str, table: str) -> str:
+    """Billing cost SQL for a project; the start date is the @start_date param."""
+    validate_project_id(project)
+    return _COST_QUERY_TEMPLATE.format(project=project, dataset=dataset, table=table)
+
 
 class GCPBillingProvider(BillingProvider):
     _BQ_DATASET = "billing_export"
@@ -89,13 +403,13 @@ class GCPBillingProvider(BillingProvider):
         )
 
     async def get_costs(self, days: int = 30) -> List[NormalizedCost]:
-        loop = asyncio.get_running_loop()
+        return await self._cached_costs(
+            ("gcp", self.project_id, days), lambda: self._fetch_costs(days)
+        )
+
+    async def _fetch_costs(self, days: int) -> List[NormalizedCost]:
         try:
-            # Run in dedicated executor so cancellation doesn't orphan the thread pool
-            return await asyncio.wait_for(
-                loop.run_in_executor(_BQ_EXECUTOR, self._get_costs_sync, days),
-                timeout=_BQ_TIMEOUT_S,
-            )
+            return await asyncio.wait_for(self._query_costs(days), timeout=_BQ_TIMEOUT_S)
         except asyncio.TimeoutError:
             logger.error(f"GCP Billing query timed out after {_BQ_TIMEOUT_S}s")
             return []
@@ -104,61 +418,59 @@ class GCPBillingProvider(BillingProvider):
             logger.warning("GCP Billing query cancelled by MCP client")
             raise
 
-    def _get_costs_sync(self, days: int) -> List[NormalizedCost]:
-        try:
-            from google.cloud import bigquery
-        except ImportError:
-            logger.error("google-cloud-bigquery not installed")
-            return []
-
+    async def _query_costs(self, days: int) -> List[NormalizedCost]:
         if not self.project_id:
             logger.error("No project_id for GCP billing")
             return []
 
         # GCP billing export has a ~10 day lag — enforce a minimum 14-day window
         effective_days = max(days, 14)
-        start_date = (datetime.utcnow() - timedelta(days=effective_days)).strftime("%Y-%m-%d")
-        table = f"`{self.project_id}.{self._BQ_DATASET}.{self._BQ_TABLE_PATTERN}`"
-
-        # _TABLE_SUFFIX only works on date-sharded tables (suffix = YYYYMMDD).
-        # Billing exports use billing-account-ID suffixes, so filter by usage_start_time only.
-        query = f"""
-            SELECT
-                service.description    AS service_name,
-                currency               AS currency,
-                SUM(cost)              AS total_cost,
-                MIN(usage_start_time)  AS usage_timestamp
-            FROM {table}
-            WHERE
-                DATE(usage_start_time) >= '{start_date}'
-                AND cost > 0
-            GROUP BY
-                service_name, currency
-            ORDER BY
-                total_cost DESC
-        """
+        start_date = (datetime.now(timezone.utc) - timedelta(days=effective_days)).strftime("%Y-%m-%d")
 
         try:
-            creds = _load_credentials()
-            client = bigquery.Client(project=self.project_id, credentials=creds)
-            job_config = bigquery.QueryJobConfig(use_query_cache=True)
-            query_job = client.query(query, job_config=job_config)
-            # Use a shorter timeout here — asyncio.wait_for above is the real guard
-            rows = list(query_job.result(timeout=50))
+            query = _cost_query(self.project_id, self._BQ_DATASET, self._BQ_TABLE_PATTERN)
+            # google.auth is sync — keep token acquisition off the event loop
+            token = await _get_gcp_token_async()
+            # Only the date varies between calls, and only once a day, so the
+            # query text is stable and BigQuery's results cache can hit.
+            payload = {
+                "query": query,
+                "useLegacySql": False,
+                "useQueryCache": True,
+                "parameterMode": "NAMED",
+                "queryParameters": [
+                    {
+                        "name": "start_date",
+                        "parameterType": {"type": "DATE"},
+                        "parameterValue": {"value": start_date},
+                    }
+                ],
+                "formatOptions": {"useInt64Timestamp": True},
+            }
+            async with httpx.AsyncClient(
+                timeout=_BQ_HTTP_TIMEOUT_S,
+                headers={"Authorization": f"Bearer {token}"},
+            ) as client:
+                data = await _run_bq_query(client, self.project_id, payload)
 
             costs = []
-            now = datetime.utcnow()
-            for row in rows:
-                raw_cost = row.get("total_cost", 0)
-                cost_float = float(raw_cost) if isinstance(raw_cost, Decimal) else float(raw_cost or 0)
-                ts = row.get("usage_timestamp") or now
+            now = datetime.now(timezone.utc)
+            for row in _parse_query_rows(data):
+                cost_float = float(row.get("total_cost") or 0)
+                raw_ts = row.get("usage_timestamp")
+                # useInt64Timestamp → microseconds since epoch, as a string
+                ts = (
+                    datetime.fromtimestamp(int(raw_ts) / 1_000_000, tz=timezone.utc)
+                    if raw_ts
+                    else now
+                )
                 costs.append(NormalizedCost(
                     provider="gcp",
-                    service=row.get("service_name", "Unknown"),
+                    service=row.get("service_name") or "Unknown",
                     region="global",
                     resource_id="aggregated",
                     cost=round(cost_float, 4),
-                    currency=row.get("currency", "USD"),
+                    currency=row.get("currency") or "USD",
                     timestamp=ts,
                     tags={},
                     project_id=self.project_id
@@ -6,8 +6,12 @@ Merges AnalysisResult objects from multiple cloud providers into
 a unified multi-cloud view.
 """
 
-from typing import List, Dict
-from datetime import datetime
+import heapq
+import logging
+from collections import Counter
+from itertools import chain
+from typing import Dict, List
+from .context import request_timestamp
 from .models import AnalysisResult
 from .logging import get_logger
 
@@ -32,77 +36,99 @@ class AggregationEngine:
         if len(results) == 1:
             return results[0]
 
-        logger.info(f"Aggregating results from {len(results)} providers")
+        logger.info("Aggregating results from %d providers", len(results))
 
-        all_resources = []
         total_cost = 0.0
         total_waste = 0.0
-        all_anomalies = []
-        all_governance = []
-        all_optimizations = []
-        all_daily_trends = []
-        all_cost_drivers = []
-        all_high_cost = []
-        all_idle = []
-        all_waste_findings = []
-        resource_types: Dict[str, int] = {}
+        resource_types: Dict[str, int] = Counter()
         running_count = 0
-        providers_seen = []
-
+        providers_seen: List[str] = []
+        forecasts: List[Dict] = []
+        risk_scores: List[float] = []
+        contributing: List[AnalysisResult] = []
+        all_resources: list = []
+        all_anomalies: list = []
+        all_daily_trends: list = []
+        all_governance: list = []
+        all_idle: list = []
+        all_waste_findings: list = []
+
+        # One walk over the results: each one's fields are read while it is
+        # hot, instead of one pass per aggregate.
         for r in results:
             provider = r.meta.get("provider", "unknown")
             providers_seen.append(provider)
+            forecasts.append(r.forecast)
+            if r.executive_summary:
+                risk_scores.append(r.executive_summary.get("risk_score", 0))
 
-            # Resources
-            all_resources.extend(r.resources)
+            # Providers with no resources and no cost (failed or empty
+            # accounts) contribute nothing to the list fields; they stay in
+            # providers_seen.
+            if not (r.resources or r.summary.get("total_cost")):
+                continue
+            contributing.append(r)
 
             # Cost
             total_cost += r.summary.get("total_cost", 0)
             total_waste += r.summary.get("total_waste", 0)
 
-            # Anomalies — tag with provider
+            # Anomalies — tag with provider. Per-provider results may be
+            # cached and shared (Orchestrator.analyze), so never mutate their
+            # rows: copy unless already tagged with this provider.
             for a in r.anomalies:
-                a_copy = {**a, "provider": provider}
-                all_anomalies.append(a_copy)
+                all_anomalies.append(
+                    a if a.get("provider") == provider else {**a, "provider": provider}
+                )
 
-            # Governance
-            all_governance.extend(r.governance_issues)
+            # Daily trends — Orchestrator._reduce already tags its rows; copy
+            # and tag any that arrive without a provider.
+            for t in r.daily_trends:
+                all_daily_trends.append(
+                    t if "provider" in t else {**t, "provider": provider}
+                )
 
-            # Optimizations
-            all_optimizations.extend(r.optimizations)
+            running_count += r.running_count
 
-            # Daily trends — tag with provider
-            for trend in r.daily_trends:
-                trend_copy = {**trend, "provider": provider}
-                all_daily_trends.append(trend_copy)
+            # Resource type counts
+            resource_types.update(r.resource_types)
 
-            # Enrichments
-            all_cost_drivers.extend(r.cost_drivers)
-            all_high_cost.extend(r.high_cost_resources)
+            all_resources.extend(r.resources)
+            all_governance.extend(r.governance_issues)
             all_idle.extend(r.idle_resources)
             all_waste_findings.extend(r.waste_findings)
-            running_count += r.running_count
 
-            # Resource type counts
-            for rtype, count in r.resource_types.items():
-                resource_types[rtype] = resource_types.get(rtype, 0) + count
+        # Inputs need not arrive ordered (only Orchestrator._reduce sorts its
+        # trends), so sort; Timsort merges runs that are already sorted in
+        # near-linear time. Top-20 lists only keep 20 items.
+        merged_daily_trends = sorted(all_daily_trends, key=lambda x: x.get("date", ""))
+        merged_optimizations = sorted(
+            chain.from_iterable(r.optimizations for r in contributing),
+            key=lambda x: x.get("potential_savings", 0),
+            reverse=True,
+        )
+        top_cost_drivers = heapq.nlargest(
+            20,
+            chain.from_iterable(r.cost_drivers for r in contributing),
+            key=lambda x: x.get("cost", 0),
+        )
+        top_high_cost = heapq.nlargest(
+            20,
+            chain.from_iterable(r.high_cost_resources for r in contributing),
+            key=lambda x: x.get("cost_30d", 0),
+        )
 
         # Build merged forecast
-        merged_forecast = self._merge_forecasts([r.forecast for r in results])
+        merged_forecast = self._merge_forecasts(forecasts)
 
         # Build executive summary
-        risk_scores = [
-            r.executive_summary.get("risk_score", 0)
-            for r in results
-            if r.executive_summary
-        ]
         avg_risk = sum(risk_scores) / len(risk_scores) if risk_scores else 0
 
         merged = AnalysisResult(
             meta={
                 "provider": ",".join(providers_seen),
                 "type": "multi-cloud-aggregate",
-                "generated_at": datetime.utcnow().isoformat(),
+                "generated_at": request_timestamp(),
                 "source_count": str(len(results)),
             },
             summary={
@@ -119,39 +145,27 @@ class AggregationEngine:
                 "provider_count": len(providers_seen),
             },
             trends={"aggregated": True, "provider_count": len(results)},
-            daily_trends=sorted(
-                all_daily_trends,
-                key=lambda x: x.get("date", ""),
-            ),
+            daily_trends=merged_daily_trends,
             anomalies=all_anomalies,
             forecast=merged_forecast,
             governance_issues=all_governance,
-            optimizations=sorted(
-                all_optimizations,
-                key=lambda x: x.get("potential_savings", 0),
-                reverse=True,
-            ),
+            optimizations=merged_optimizations,
             resources=all_resources,
-            cost_drivers=sorted(
-                all_cost_drivers,
-                key=lambda x: x.get("cost", 0),
-                reverse=True,
-            )[:20],
-            resource_types=resource_types,
+            cost_drivers=top_cost_drivers,
+            # plain dict: dataclasses.asdict() cannot rebuild a Counter
+            resource_types=dict(resource_types),
             running_count=running_count,
-            high_cost_resources=sorted(
-                all_high_cost,
-                key=lambda x: x.get("cost", 0),
-                reverse=True,
-            )[:20],
+            high_cost_resources=top_high_cost,
             idle_resources=all_idle,
             waste_findings=all_waste_findings,
         )
 
-        logger.info(
-            f"Aggregation complete: {len(all_resources)} resources, "
-            f"${total_cost:,.2f} total cost across {len(providers_seen)} providers"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            # f-string for the thousands separator; only built if emitted.
+            logger.info(
+                f"Aggregation complete: {len(all_resources)} resources, "
+                f"${total_cost:,.2f} total cost across {len(providers_seen)} providers"
+            )
 
         return merged
 
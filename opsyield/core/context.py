@@ -1,8 +1,29 @@
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
 CURRENT_PROJECT = None
 
+# ISO timestamp shared by every builder within one request/tool call.
+_request_ts: ContextVar[Optional[str]] = ContextVar("request_ts", default=None)
+
 def set_project(project_id: str):
     global CURRENT_PROJECT
     CURRENT_PROJECT = project_id
 
 def get_project():
     return CURRENT_PROJECT
+
+def _utc_iso() -> str:
+    # Naive UTC, same format as the datetime.utcnow().isoformat() it replaces.
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+def start_request() -> str:
+    """Stamp the current context with a fresh request timestamp and return it."""
+    ts = _utc_iso()
+    _request_ts.set(ts)
+    return ts
+
+def request_timestamp() -> str:
+    """The current request's timestamp, or the current time outside a request."""
+    return _request_ts.get() or _utc_iso()
@@ -13,16 +13,21 @@ Features:
     - Thread-safe, async-safe
 """
 
+import atexit
+import copy
 import logging
 import logging.config
-import json
+import logging.handlers
 import os
+import queue
 import sys
 import time
 import uuid
+import weakref
 from contextvars import ContextVar
-from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, Tuple
+
+from ..utils.helpers import json_dumps_str
 
 # ─────────────────────────────────────────────────────────────
 # Correlation ID Context
@@ -48,15 +53,38 @@ def get_correlation_id() -> Optional[str]:
 # ─────────────────────────────────────────────────────────────
 
 
+# Optional structured fields copied from `extra={}` when present.
+_EXTRA_KEYS = (
+    "request_id",
+    "provider",
+    "duration_ms",
+    "resource_count",
+    "error_type",
+)
+
+
 class StructuredJSONFormatter(logging.Formatter):
     """
     Emits each log record as a single-line JSON object.
     Fields: timestamp, level, logger, message, correlation_id, module, funcName, lineno
     """
 
+    # (epoch second, "YYYY-MM-DDTHH:MM:SS") for the last record formatted;
+    # one tuple so concurrent threads never see a mismatched pair.
+    _second_cache: Tuple[Optional[int], str] = (None, "")
+
+    def _timestamp(self, created: float) -> str:
+        """ISO-8601 UTC from record.created, reusing the per-second prefix."""
+        second = int(created)
+        cached_second, prefix = self._second_cache
+        if cached_second != second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second_cache = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1_000_000):06d}+00:00"
+
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -65,28 +93,55 @@ class StructuredJSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
 
+        # `extra={}` fields land in the record's __dict__; plain dict lookups
+        # are cheaper than getattr with a default.
+        attrs = record.__dict__
+
         # Inject correlation ID
-        cid = getattr(record, "correlation_id", None) or get_correlation_id()
+        cid = attrs.get("correlation_id") or get_correlation_id()
         if cid:
             log_entry["correlation_id"] = cid
 
-        # Merge any extra fields passed via `extra={}`
-        for key in (
-            "request_id",
-            "provider",
-            "duration_ms",
-            "resource_count",
-            "error_type",
-        ):
-            val = getattr(record, key, None)
-            if val is not None:
-                log_entry[key] = val
-
-        # Exception info
+        # Merge any extra fields passed via `extra={}`; most records carry
+        # none, and isdisjoint() checks all keys in one C-level call.
+        if not attrs.keys().isdisjoint(_EXTRA_KEYS):
+            for key in _EXTRA_KEYS:
+                val = attrs.get(key)
+                if val is not None:
+                    log_entry[key] = val
+
+        # Exception info (exc_text when pre-rendered by _ContextQueueHandler)
         if record.exc_info and record.exc_info[0] is not None:
             log_entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_entry["exception"] = record.exc_text
+
+        return json_dumps_str(log_entry, default=str)
+
+
+class _ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records for the background listener thread.
 
-        return json.dumps(log_entry, default=str)
+    Captures what only the calling thread knows (correlation ID contextvar,
+    traceback) and keeps the record structured, unlike the stock prepare()
+    which flattens message and traceback into one string.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if getattr(record, "correlation_id", None) is None:
+            record.correlation_id = get_correlation_id()
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None  # rendered above; don't pin the caller's frames
+        return record
 
 
 # ─────────────────────────────────────────────────────────────
@@ -96,6 +151,7 @@ class StructuredJSONFormatter(logging.Formatter):
 _LOG_LEVEL = os.environ.get("OPSYIELD_LOG_LEVEL", "INFO").upper()
 _LOG_FORMAT = os.environ.get("OPSYIELD_LOG_FORMAT", "json")  # "json" or "text"
 _configured = False
+_listener: Optional[logging.handlers.QueueListener] = None
 
 
 def configure_logging(
@@ -106,8 +162,11 @@ def configure_logging(
     """
     Configure logging for the entire OpsYield application.
     Call once at startup. Idempotent — subsequent calls are no-ops.
+
+    Callers only enqueue records; formatting and the stream write happen on
+    a QueueListener thread, stopped (and drained) at interpreter exit.
     """
-    global _configured
+    global _configured, _listener
     if _configured:
         return
     _configured = True
@@ -127,7 +186,14 @@ def configure_logging(
             )
         )
 
-    root.addHandler(handler)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root.addHandler(_ContextQueueHandler(log_queue))
 
     # Suppress noisy third-party loggers
     for noisy in ("urllib3", "httpx", "google", "botocore", "boto3", "azure"):
@@ -139,20 +205,29 @@ def configure_logging(
 # ─────────────────────────────────────────────────────────────
 
 
+# Requested name -> Logger; skips prefixing and the logging module lock on
+# repeat lookups. Weak: logging's manager already owns the loggers.
+_LOGGER_CACHE: "weakref.WeakValueDictionary[str, logging.Logger]" = (
+    weakref.WeakValueDictionary()
+)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a namespaced logger under the 'opsyield' hierarchy.
 
     Usage:
         logger = get_logger(__name__)  # e.g., 'opsyield.core.orchestrator'
-    """
-    configure_logging()
-
-    # Ensure all modules log under opsyield.* namespace
-    if not name.startswith("opsyield"):
-        name = f"opsyield.{name}"
 
-    return logging.getLogger(name)
+    Does not configure handlers: entry points call configure_logging() once
+    at startup (api.server, mcp_stdio, mcp_sse).
+    """
+    logger = _LOGGER_CACHE.get(name)
+    if logger is None:
+        # Ensure all modules log under opsyield.* namespace
+        full_name = name if name.startswith("opsyield") else f"opsyield.{name}"
+        logger = _LOGGER_CACHE[name] = logging.getLogger(full_name)
+    return logger
 
 
 class TimedOperation:
@@ -171,24 +246,41 @@ class TimedOperation:
         self.start = None
 
     def __enter__(self):
-        self.start = time.perf_counter()
-        self.logger.info(f"Starting: {self.operation}", extra=self.extra)
+        # Resolve the correlation ID once; both records carry it in `extra`,
+        # so neither the queue handler nor the formatter reads the ContextVar.
+        cid = get_correlation_id()
+        if cid is not None:
+            self.extra.setdefault("correlation_id", cid)
+        self.start = time.perf_counter_ns()
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Starting: %s", self.operation, extra=self.extra)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration_ms = round((time.perf_counter() - self.start) * 1000, 2)
-        extras = {**self.extra, "duration_ms": duration_ms}
+        # Failures are always logged; success only if INFO would be emitted.
+        if not exc_type and not self.logger.isEnabledFor(logging.INFO):
+            return False
+
+        # Integer ns span; converted to ms only here, when the record is built.
+        duration_ms = round((time.perf_counter_ns() - self.start) / 1_000_000, 2)
+        # extra is owned by this instance; update it in place, no copy
+        extras = self.extra
+        extras["duration_ms"] = duration_ms
 
         if exc_type:
             extras["error_type"] = exc_type.__name__
             self.logger.error(
-                f"Failed: {self.operation} ({duration_ms}ms)",
+                "Failed: %s (%sms)",
+                self.operation,
+                duration_ms,
                 extra=extras,
                 exc_info=True,
             )
         else:
             self.logger.info(
-                f"Completed: {self.operation} ({duration_ms}ms)",
+                "Completed: %s (%sms)",
+                self.operation,
+                duration_ms,
                 extra=extras,
             )
         return False  # Don't suppress exceptions
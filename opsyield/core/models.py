@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Dict, Optional, Any, List
 
 
-@dataclass
+@dataclass(slots=True)
 class NormalizedCost:
     """
     Unified Billing Normalization Object.
@@ -29,7 +29,7 @@ class NormalizedCost:
     tags: Dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Resource:
     """
     Unified Resource Model (Tri-Cloud).
@@ -79,7 +79,7 @@ class Resource:
     )  # List of resource IDs this resource depends on
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     meta: Dict[str, str]
     summary: Dict[str, Any]
@@ -8,16 +8,56 @@ Aggregation logic is delegated to AggregationEngine (SRP).
 """
 
 import asyncio
-from datetime import datetime
+import heapq
+import os
+from collections import Counter, defaultdict
+from dataclasses import replace
+from operator import itemgetter
 from typing import Dict, Any, List, Optional
 
 from ..providers.factory import ProviderFactory
-from .models import AnalysisResult, Resource
+from .models import AnalysisResult, NormalizedCost, Resource
 from .aggregation import AggregationEngine
+from .context import request_timestamp, start_request
 from .logging import get_logger, TimedOperation
+from ..utils.cache import TTLCache
+from ..utils.helpers import ensure_default_executor, gather_with_limit
 
 logger = get_logger(__name__)
 
+# Per-provider budget inside aggregate_analysis. analyze() already caps its
+# cost/infra fetches at 28s each (run concurrently); this bounds the rest.
+_AGGREGATE_PROVIDER_TIMEOUT_S = 40
+
+# Seconds to reuse an analyze() result for identical arguments.
+_ANALYSIS_CACHE_TTL_S = float(os.environ.get("OPSYIELD_ANALYSIS_CACHE_TTL", "60"))
+
+# Lowercased resource states counted as running.
+_RUNNING_STATES = frozenset({"running", "active", "online"})
+
+
+# Env vars that pick the account a provider reads when the caller passes no
+# explicit project/subscription; part of the analysis cache key.
+_SCOPE_ENV = {
+    "aws": ("AWS_PROFILE", "AWS_ACCESS_KEY_ID"),
+    "azure": ("AZURE_SUBSCRIPTION_ID",),
+}
+
+
+def _analysis_scope(provider_name: str, provider: Any) -> tuple:
+    """
+    The project/subscription/credentials `provider` will actually query.
+
+    Resolved from the provider instance (GCPProvider.project_id falls back to
+    the active project and GOOGLE_CLOUD_PROJECT), so callers passing
+    project_id=None don't share one cache entry across projects.
+    """
+    return (
+        getattr(provider, "project_id", None),
+        getattr(provider, "subscription_id", None),
+        tuple(os.environ.get(k) for k in _SCOPE_ENV.get(provider_name.lower(), ())),
+    )
+
 
 class Orchestrator:
     """
@@ -29,6 +69,9 @@ class Orchestrator:
 
     def __init__(self):
         self._aggregator = AggregationEngine()
+        # Short-lived: absorbs run_finops_intelligence followed by
+        # aggregate_finops, or repeated tool calls, within one session.
+        self._analysis_cache = TTLCache(ttl=_ANALYSIS_CACHE_TTL_S, maxsize=64)
 
     async def analyze(
         self,
@@ -40,111 +83,159 @@ class Orchestrator:
         """
         Run a full analysis for a single cloud provider.
         Returns an AnalysisResult dataclass ready for the API adapter.
+
+        Results are reused within the analysis cache TTL for the same
+        provider, days and resolved project/subscription/credentials, and
+        concurrent identical calls share one run. Results with no costs and
+        no resources (e.g. a failed provider) are not cached.
         """
+        ensure_default_executor()
+        provider = ProviderFactory.get_provider(
+            provider_name,
+            project_id=project_id,
+            subscription_id=subscription_id,
+        )
+        key = (provider_name, days, _analysis_scope(provider_name, provider))
+        result = await self._analysis_cache.get_or_compute(
+            key,
+            lambda: self._analyze(provider_name, provider, days),
+            should_cache=lambda r: bool(r.daily_trends or r.resources),
+        )
+        # A cached result carries the generated_at of the request that built
+        # it; stamp a shallow copy with this request's timestamp instead.
+        ts = request_timestamp()
+        if result.meta.get("generated_at") != ts:
+            result = replace(result, meta={**result.meta, "generated_at": ts})
+        return result
+
+    async def _analyze(
+        self, provider_name: str, provider: Any, days: int
+    ) -> AnalysisResult:
         with TimedOperation(logger, f"analyze:{provider_name}", provider=provider_name):
-            provider = ProviderFactory.get_provider(
-                provider_name,
-                project_id=project_id,
-                subscription_id=subscription_id,
-            )
-
             # — Fetch data concurrently with hard timeouts ————————————
             # Timeouts prevent MCP cancellation from leaving orphaned threads.
             # Each sub-task has its own budget; if one times out the other still returns.
-            costs_task = asyncio.create_task(
-                _safe_timed(provider.get_costs(days), [], timeout=28)
+            costs, resources = await asyncio.gather(
+                _safe_timed(provider.get_costs(days), [], timeout=28),
+                _safe_timed(provider.get_infrastructure(), [], timeout=28),
             )
-            infra_task = asyncio.create_task(
-                _safe_timed(provider.get_infrastructure(), [], timeout=28)
-            )
-
-            costs, resources = await asyncio.gather(costs_task, infra_task)
 
-            # — Build daily trends from NormalizedCost list ——————————
-            daily_map: Dict[str, float] = {}
-            total_cost = 0.0
-            cost_by_service: Dict[str, float] = {}
+            # — Reduce in a worker thread ————————————————————————————
+            # Pure-Python loops over thousands of rows; off the loop, other
+            # providers' I/O in an aggregate keeps progressing meanwhile.
+            # to_thread copies contextvars (correlation_id) into the worker.
+            return await asyncio.to_thread(
+                self._reduce, provider_name, days, costs, resources
+            )
 
-            for c in costs:
+    def _reduce(
+        self,
+        provider_name: str,
+        days: int,
+        costs: List[NormalizedCost],
+        resources: List[Any],
+    ) -> AnalysisResult:
+        """Build the AnalysisResult from fetched costs/resources (CPU only)."""
+        # — Build daily trends from NormalizedCost list ——————————
+        daily_map: Dict[str, float] = defaultdict(float)
+        cost_by_service: Dict[str, float] = defaultdict(float)
+        # Rows repeat the same few (<= days) timestamps across services.
+        day_of: Dict[Any, str] = {}
+
+        for c in costs:
+            ts = c.timestamp
+            day = day_of.get(ts)
+            if day is None:
                 day = (
-                    c.timestamp.strftime("%Y-%m-%d")
-                    if hasattr(c.timestamp, "strftime")
-                    else str(c.timestamp)[:10]
-                )
-                daily_map[day] = daily_map.get(day, 0.0) + c.cost
-                total_cost += c.cost
-                cost_by_service[c.service] = (
-                    cost_by_service.get(c.service, 0.0) + c.cost
+                    ts.strftime("%Y-%m-%d") if hasattr(ts, "strftime") else str(ts)[:10]
                 )
+                day_of[ts] = day
+            cost = c.cost
+            daily_map[day] += cost
+            cost_by_service[c.service] += cost
+
+        # Summed over the per-service buckets (tens of entries), not per row.
+        total_cost = sum(cost_by_service.values())
+
+        # Tagged here so AggregationEngine.merge can merge rows without copying.
+        daily_trends = [
+            {"date": d, "amount": v, "provider": provider_name}
+            for d, v in sorted(daily_map.items())
+        ]
+
+        # — Cost drivers (top services) ————————————————————————
+        cost_drivers = [
+            {"service": svc, "cost": amt}
+            for svc, amt in heapq.nlargest(
+                10, cost_by_service.items(), key=itemgetter(1)
+            )
+        ]
 
-            daily_trends = [
-                {"date": d, "amount": round(v, 4)} for d, v in sorted(daily_map.items())
-            ]
+        # — Single pass over resources ———————————————————————
+        scan = self._analyze_all(resources)
 
-            # — Cost drivers (top services) ————————————————————————
-            cost_drivers = sorted(
-                [
-                    {"service": svc, "cost": round(amt, 4)}
-                    for svc, amt in cost_by_service.items()
-                ],
-                key=lambda x: x["cost"],
-                reverse=True,
-            )[:10]
-
-            # — Resource type breakdown ————————————————————————————
-            resource_types: Dict[str, int] = {}
-            running_count = 0
-            high_cost: List[Dict[str, Any]] = []
-
-            for r in resources:
-                if isinstance(r, Resource):
-                    rtype = r.type or "unknown"
-                    resource_types[rtype] = resource_types.get(rtype, 0) + 1
-                    if r.state and r.state.upper() in ("RUNNING", "ACTIVE", "ONLINE"):
-                        running_count += 1
-                    if r.cost_30d and r.cost_30d > 10:
-                        high_cost.append(
-                            {
-                                "id": r.id,
-                                "name": r.name,
-                                "type": r.type,
-                                "cost_30d": r.cost_30d,
-                            }
-                        )
-
-            return AnalysisResult(
-                meta={
-                    "provider": provider_name,
-                    "period_days": str(days),
-                    "generated_at": datetime.utcnow().isoformat(),
-                },
-                summary={
-                    "total_cost": round(total_cost, 4),
-                    "currency": "USD",
-                    "resource_count": len(resources),
-                },
-                executive_summary={
-                    "total_spend": round(total_cost, 4),
-                    "risk_score": 0,
-                    "anomaly_count": 0,
-                    "active_recommendations": 0,
-                },
-                trends={},
-                daily_trends=daily_trends,
-                anomalies=[],
-                forecast={},
-                governance_issues=[],
-                optimizations=[],
-                resources=resources,
-                cost_drivers=cost_drivers,
-                resource_types=resource_types,
-                running_count=running_count,
-                high_cost_resources=sorted(
-                    high_cost, key=lambda x: x["cost_30d"], reverse=True
-                )[:20],
-                idle_resources=[],
-                waste_findings=[],
-            )
+        return AnalysisResult(
+            meta={
+                "provider": provider_name,
+                "period_days": str(days),
+                "generated_at": request_timestamp(),
+            },
+            summary={
+                "total_cost": round(total_cost, 4),
+                "currency": "USD",
+                "resource_count": len(resources),
+            },
+            executive_summary={
+                "total_spend": round(total_cost, 4),
+                "risk_score": 0,
+                "anomaly_count": 0,
+                "active_recommendations": 0,
+            },
+            trends={},
+            daily_trends=daily_trends,
+            anomalies=[],
+            forecast={},
+            governance_issues=[],
+            optimizations=[],
+            resources=resources,
+            cost_drivers=cost_drivers,
+            resource_types=scan["resource_types"],
+            running_count=scan["running_count"],
+            high_cost_resources=heapq.nlargest(
+                20, scan["high_cost"], key=lambda x: x["cost_30d"]
+            ),
+            idle_resources=[],
+            waste_findings=[],
+        )
+
+    @staticmethod
+    def _analyze_all(resources: List[Any]) -> Dict[str, Any]:
+        """
+        Visit every resource once, computing type counts, the running count
+        and high-cost entries together; the lowercased state is computed once.
+        """
+        resource_types: Dict[str, int] = Counter()
+        running_count = 0
+        high_cost: List[Dict[str, Any]] = []
+
+        for r in resources:
+            if not isinstance(r, Resource):
+                continue
+            resource_types[r.type or "unknown"] += 1
+            if (r.state or "").lower() in _RUNNING_STATES:
+                running_count += 1
+            cost = r.cost_30d
+            if cost and cost > 10:
+                high_cost.append(
+                    {"id": r.id, "name": r.name, "type": r.type, "cost_30d": cost}
+                )
+
+        return {
+            # plain dict: dataclasses.asdict() cannot rebuild a Counter
+            "resource_types": dict(resource_types),
+            "running_count": running_count,
+            "high_cost": high_cost,
+        }
 
     async def aggregate_analysis(
         self,
@@ -157,20 +248,30 @@ class Orchestrator:
         Run analysis across multiple providers and delegate merging
         to AggregationEngine.
         """
-        from ..utils.helpers import gather_with_limit
-
+        ensure_default_executor()
+        # One generated_at for the aggregate; provider tasks inherit it.
+        start_request()
         with TimedOperation(logger, "aggregate_analysis", provider=",".join(providers)):
+            # Providers run concurrently; each gets its own budget so one slow
+            # cloud is dropped from the aggregate instead of stalling it.
             coros = [
-                self.analyze(p, days=days, project_id=project_id, subscription_id=subscription_id)
+                asyncio.wait_for(
+                    self.analyze(p, days=days, project_id=project_id, subscription_id=subscription_id),
+                    timeout=_AGGREGATE_PROVIDER_TIMEOUT_S,
+                )
                 for p in providers
             ]
             raw_results = await gather_with_limit(coros, limit=5)
 
             # Filter out failures
             valid_results = []
-            for res in raw_results:
-                if isinstance(res, Exception):
-                    logger.error(f"Provider failed during aggregate: {res}")
+            for name, res in zip(providers, raw_results):
+                if isinstance(res, asyncio.TimeoutError):
+                    logger.error(
+                        f"Provider '{name}' timed out after {_AGGREGATE_PROVIDER_TIMEOUT_S}s during aggregate"
+                    )
+                elif isinstance(res, Exception):
+                    logger.error(f"Provider '{name}' failed during aggregate: {res}")
                 else:
                     valid_results.append(res)
 
@@ -184,7 +285,7 @@ class Orchestrator:
             "anomalies_detected": 0,
             "forecasts_generated": 0,
             "recommendations_found": 0,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": request_timestamp(),
             "note": "No DB-backed engines — call /api/analyze for live provider data.",
         }
 
@@ -193,7 +294,7 @@ class Orchestrator:
         return {
             "meta": {
                 "period": f"{days} days",
-                "generated_at": datetime.utcnow().isoformat(),
+                "generated_at": request_timestamp(),
             },
             "summary": {"total_cost": 0, "risk_score": 0, "currency": "USD"},
             "executive_summary": {
@@ -213,15 +314,6 @@ class Orchestrator:
 # — Utility ———————————————————————————————————————————————
 
 
-async def _safe(coro, default):
-    """Await a coroutine, return default on any exception."""
-    try:
-        return await coro
-    except Exception as e:
-        logger.warning(f"Provider call failed (returning default): {e}")
-        return default
-
-
 async def _safe_timed(coro, default, timeout: float = 28):
     """Await a coroutine with a hard timeout, return default on timeout or error."""
     try:
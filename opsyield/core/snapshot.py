@@ -1,11 +1,15 @@
+import gzip
 import json
 from typing import Dict, Any, List
 from dataclasses import dataclass, field
 
 from .logging import get_logger
+from ..utils.helpers import json_dumps, json_loads
 
 logger = get_logger(__name__)
 
+_GZIP_MAGIC = b"\x1f\x8b"
+
 
 @dataclass
 class DiffResult:
@@ -25,9 +29,18 @@ class SnapshotManager:
 
     @staticmethod
     def save(data: Dict[str, Any], path: str):
+        """
+        Write a snapshot. A ".gz" path gets compact JSON (orjson when
+        installed) gzipped at level 1; any other path stays indented,
+        diff-friendly JSON.
+        """
         try:
-            with open(path, "w") as f:
-                json.dump(data, f, indent=2)
+            if path.endswith(".gz"):
+                payload = gzip.compress(json_dumps(data), compresslevel=1)
+            else:
+                payload = json.dumps(data, indent=2).encode("utf-8")
+            with open(path, "wb") as f:
+                f.write(payload)
             logger.info(f"Snapshot saved to {path}")
         except Exception as e:
             logger.error(f"Failed to save snapshot: {e}")
@@ -35,9 +48,13 @@ class SnapshotManager:
 
     @staticmethod
     def load(path: str) -> Dict[str, Any]:
+        """Read a snapshot, gzipped or plain (sniffed by magic bytes)."""
         try:
-            with open(path, "r") as f:
-                return json.load(f)
+            with open(path, "rb") as f:
+                raw = f.read()
+            if raw[:2] == _GZIP_MAGIC:
+                raw = gzip.decompress(raw)
+            return json_loads(raw)
         except Exception as e:
             logger.error(f"Failed to load snapshot from {path}: {e}")
             raise
@@ -78,16 +95,14 @@ class SnapshotManager:
                 f"Risk score increased by {result.risk_score_change:.2f}"
             )
 
-        # 3. New Anomalies
+        # 3. New Anomalies (hashed id lookup: O(baseline + current))
         base_anomalies = {
             a.get("id") for a in baseline.get("analytics", {}).get("anomalies", [])
         }
         curr_anomalies_list = current.get("analytics", {}).get("anomalies", [])
-        new_anomalies_count = 0
-
-        for anomaly in curr_anomalies_list:
-            if anomaly.get("id") not in base_anomalies:
-                new_anomalies_count += 1
+        new_anomalies_count = sum(
+            1 for a in curr_anomalies_list if a.get("id") not in base_anomalies
+        )
 
         result.new_anomalies = new_anomalies_count
         if new_anomalies_count > 0:
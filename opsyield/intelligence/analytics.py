@@ -1,6 +1,14 @@
 from typing import List, Dict, Any
 from datetime import datetime
-import statistics
+import math
+
+
+def _mean_amount(rows: List[Dict[str, Any]]) -> float:
+    """
+    Mean of rows' "amount" in plain float arithmetic (statistics.mean goes
+    through exact Fraction math, far slower for the same float result).
+    """
+    return math.fsum(r["amount"] for r in rows) / len(rows)
 
 
 class ComparisonEngine:
@@ -70,11 +78,10 @@ class ForecastEngine:
             return {}
 
         # Simple linear regression or moving average
-        values = [d["amount"] for d in daily_history]
-        if len(values) < 2:
-            return {"predicted_total": sum(values)}
+        if len(daily_history) < 2:
+            return {"predicted_total": sum(d["amount"] for d in daily_history)}
 
-        avg_daily = statistics.mean(values[-7:])  # Last 7 days average
+        avg_daily = _mean_amount(daily_history[-7:])  # Last 7 days average
 
         predicted_total = avg_daily * days_ahead
 
@@ -1,14 +1,14 @@
 # mcp_sse.py
 
-import json
 import os
 import sys
 from pathlib import Path
 from opsyield.core.logging import configure_logging
 from mcp.server.fastmcp import FastMCP
 from mcp.server.transport_security import TransportSecuritySettings
+from opsyield.core.context import start_request
 from opsyield.core.orchestrator import Orchestrator
-from opsyield.api.adapters.analysis_adapter import adapt_analysis_result
+from opsyield.api.adapters.analysis_adapter import analysis_result_json
 
 # Ensure project root is discoverable
 _PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
@@ -35,6 +35,7 @@ async def run_finops_intelligence(
     subscription_id: str = "",
 ) -> str:
 
+    start_request()
     effective_project_id = project_id.strip() or os.getenv("GOOGLE_CLOUD_PROJECT")
 
     result = await _orchestrator.analyze(
@@ -44,7 +45,7 @@ async def run_finops_intelligence(
         subscription_id=subscription_id.strip() or None,
     )
 
-    return json.dumps(adapt_analysis_result(result), default=str)
+    return analysis_result_json(result)
 
 
 @mcp.tool()
@@ -60,7 +61,7 @@ async def aggregate_finops(
         subscription_id=subscription_id.strip() or None,
     )
 
-    return json.dumps(adapt_analysis_result(result), default=str)
+    return analysis_result_json(result)
 
 
 if __name__ == "__main__":
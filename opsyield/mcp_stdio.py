@@ -1,6 +1,6 @@
-import json
 import os
 import sys
+from collections import Counter, defaultdict
 from pathlib import Path
 
 # Ensure the project root is on sys.path so 'opsyield' package is discoverable
@@ -14,9 +14,12 @@ from opsyield.core.logging import configure_logging
 configure_logging(level="ERROR", stream=sys.stderr)
 
 from mcp.server.fastmcp import FastMCP
-from opsyield.core.orchestrator import Orchestrator
-from opsyield.api.adapters.analysis_adapter import adapt_analysis_result
-from opsyield.core.context import set_project, get_project
+from opsyield.core.orchestrator import _RUNNING_STATES, Orchestrator
+from opsyield.core.models import Resource
+from opsyield.providers.factory import ProviderFactory
+from opsyield.api.adapters.analysis_adapter import analysis_result_json
+from opsyield.core.context import set_project, get_project, request_timestamp, start_request
+from opsyield.utils.helpers import json_dumps_str
 
 mcp = FastMCP("OpsYieldFinOps")
 _orchestrator = Orchestrator()
@@ -50,25 +53,21 @@ async def get_billing_costs(
     Follow up with get_infrastructure() for resource details.
     Note: GCP billing has a ~10 day lag, days>=14 recommended.
     """
-    from opsyield.providers.factory import ProviderFactory
-    from opsyield.api.adapters.analysis_adapter import adapt_analysis_result
-    from opsyield.core.models import AnalysisResult
-    from datetime import datetime
-
+    start_request()
     pid = _resolve(project_id)
     sid = subscription_id.strip() or None
 
     provider_obj = ProviderFactory.get_provider(provider, project_id=pid, subscription_id=sid)
     costs = await provider_obj.get_costs(days)
 
-    daily_map: dict = {}
+    daily_map: dict = defaultdict(float)
     total_cost = 0.0
-    cost_by_service: dict = {}
+    cost_by_service: dict = defaultdict(float)
     for c in costs:
         day = c.timestamp.strftime("%Y-%m-%d") if hasattr(c.timestamp, "strftime") else str(c.timestamp)[:10]
-        daily_map[day] = daily_map.get(day, 0.0) + c.cost
+        daily_map[day] += c.cost
         total_cost += c.cost
-        cost_by_service[c.service] = cost_by_service.get(c.service, 0.0) + c.cost
+        cost_by_service[c.service] += c.cost
 
     daily_trends = [{"date": d, "amount": round(v, 4)} for d, v in sorted(daily_map.items())]
     cost_drivers = sorted(
@@ -77,12 +76,12 @@ async def get_billing_costs(
     )[:10]
 
     result = {
-        "meta": {"provider": provider, "period_days": str(days), "generated_at": datetime.utcnow().isoformat()},
+        "meta": {"provider": provider, "period_days": str(days), "generated_at": request_timestamp()},
         "summary": {"total_cost": round(total_cost, 4), "currency": costs[0].currency if costs else "USD"},
         "cost_drivers": cost_drivers,
         "daily_trends": daily_trends,
     }
-    return json.dumps(result, default=str)
+    return json_dumps_str(result, default=str)
 
 
 @mcp.tool()
@@ -95,34 +94,31 @@ async def get_infrastructure(
     STEP 2 — Infrastructure resources (~5-10s). Call after get_billing_costs().
     Returns: resource list, resource_types breakdown, running count.
     """
-    from opsyield.providers.factory import ProviderFactory
-    from datetime import datetime
-
+    start_request()
     pid = _resolve(project_id)
     sid = subscription_id.strip() or None
 
     provider_obj = ProviderFactory.get_provider(provider, project_id=pid, subscription_id=sid)
     resources = await provider_obj.get_infrastructure()
 
-    resource_types: dict = {}
+    resource_types: dict = Counter()
     running_count = 0
     resource_list = []
     for r in resources:
-        from opsyield.core.models import Resource
         if isinstance(r, Resource):
             rtype = r.type or "unknown"
-            resource_types[rtype] = resource_types.get(rtype, 0) + 1
-            if r.state and r.state.upper() in ("RUNNING", "ACTIVE", "ONLINE"):
+            resource_types[rtype] += 1
+            if r.state and r.state.lower() in _RUNNING_STATES:
                 running_count += 1
             resource_list.append({"id": r.id, "name": r.name, "type": r.type, "state": r.state})
 
     result = {
-        "meta": {"provider": provider, "generated_at": datetime.utcnow().isoformat()},
+        "meta": {"provider": provider, "generated_at": request_timestamp()},
         "summary": {"resource_count": len(resources), "running_count": running_count},
         "resource_types": resource_types,
         "resources": resource_list[:50],
     }
-    return json.dumps(result, default=str)
+    return json_dumps_str(result, default=str)
 
 
 @mcp.tool()
@@ -137,6 +133,7 @@ async def run_finops_intelligence(
     For faster display, call get_billing_costs() then get_infrastructure() separately instead.
     Note: GCP billing export has a ~10 day lag, days>=14 recommended.
     """
+    start_request()
     pid = _resolve(project_id)
 
     result = await _orchestrator.analyze(
@@ -146,7 +143,7 @@ async def run_finops_intelligence(
         subscription_id=subscription_id.strip() or None,
     )
 
-    return json.dumps(adapt_analysis_result(result), default=str)
+    return analysis_result_json(result)
 
 
 @mcp.tool()
@@ -160,6 +157,7 @@ async def aggregate_finops(
     Aggregate FinOps analysis across multiple cloud providers.
     project_id priority: explicit arg → context (set via configure_project) → GOOGLE_CLOUD_PROJECT env var.
     """
+    start_request()
     pid = _resolve(project_id)
 
     provider_list = [p.strip() for p in providers.split(",") if p.strip()]
@@ -171,7 +169,7 @@ async def aggregate_finops(
         subscription_id=subscription_id.strip() or None,
     )
 
-    return json.dumps(adapt_analysis_result(result), default=str)
+    return analysis_result_json(result)
 
 
 if __name__ == "__main__":
@@ -42,20 +42,18 @@ class OptimizationEngine:
         self.strategies: List[OptimizationStrategy] = [IdleScorer()]
 
     def analyze(self, costs: List[NormalizedCost]) -> List[Dict]:
+        # Bind each strategy's analyze once, not per cost item.
+        analyzers = [strategy.analyze for strategy in self.strategies]
         results = []
         for item in costs:
-            item_optimizations = []
-            for strategy in self.strategies:
-                res = strategy.analyze(item)
+            for analyze in analyzers:
+                res = analyze(item)
                 if res:
                     # Enrich result with resource details
                     res["resource_id"] = item.resource_id
                     res["service"] = item.service
                     res["cost"] = item.cost
-                    item_optimizations.append(res)
-
-            if item_optimizations:
-                results.extend(item_optimizations)
+                    results.append(res)
 
         # Sort by potential savings descending
         results.sort(key=lambda x: x.get("potential_savings", 0), reverse=True)
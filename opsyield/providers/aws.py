@@ -1,30 +1,84 @@
 """
 AWS Provider -- Production-grade cloud status detection.
 
-Uses subprocess.run(shell=True) for Windows .cmd compatibility.
-Authentication is determined by CLI exit code of `aws sts get-caller-identity`.
+Authentication is determined by STS GetCallerIdentity: through boto3 when
+installed, otherwise via `aws sts get-caller-identity` (cli_utils.run_cli).
 """
 
 import os
-import shutil
 import asyncio
+import importlib.util
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 
-try:
-    import boto3  # noqa: F401
-    from botocore.exceptions import ClientError, NoCredentialsError  # noqa: F401
-
-    HAS_BOTO3 = True
-except ImportError:
-    HAS_BOTO3 = False
-
 from ..core.models import NormalizedCost, Resource
 from ..core.logging import get_logger
-from .cli_utils import run_cli, parse_json
+from .cli_utils import which_cached, cached_identity
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _has_boto3() -> bool:
+    """
+    Whether boto3 is installed, checked without importing it: boto3/botocore
+    cost ~300 ms and ~20 MB to import, so it loads on first real use instead
+    of whenever the provider registry is imported.
+    """
+    return importlib.util.find_spec("boto3") is not None
+
+
+def aws_installed() -> bool:
+    """
+    AWS is usable with either the aws CLI on PATH or boto3 importable; the
+    one definition of "installed" for get_status and the factory fast path.
+    """
+    return which_cached("aws") is not None or _has_boto3()
+
+
+# Env vars that select the default credential chain's identity.
+_CREDENTIAL_ENV = ("AWS_PROFILE", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY")
+
+
+@lru_cache(maxsize=16)
+def _sts_client(profile: Optional[str], region: Optional[str], env: tuple):
+    """
+    One STS client per profile/region/credential env: building a Session and
+    client loads botocore's service model (~100 ms), and a kept client also
+    reuses its HTTPS connection. `env` only keys the cache.
+    """
+    import boto3
+
+    return boto3.Session(profile_name=profile, region_name=region).client("sts")
+
+
+def _sts_identity(profile: Optional[str], region: Optional[str]) -> Dict[str, Any]:
+    """GetCallerIdentity via boto3, shaped like a cached_identity() result."""
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    env = tuple(os.environ.get(k) for k in _CREDENTIAL_ENV)
+    try:
+        ident = _sts_client(profile, region, env).get_caller_identity()
+    except (BotoCoreError, ClientError) as e:
+        # Credentials may be configured (or fixed) before the next check; a
+        # client built without usable credentials would keep failing.
+        _sts_client.cache_clear()
+        return {
+            "ok": False,
+            "stdout": "",
+            "stderr": str(e),
+            "returncode": 1,
+            "identity": None,
+        }
+    return {
+        "ok": True,
+        "stdout": "",
+        "stderr": "",
+        "returncode": 0,
+        "identity": {k: ident.get(k) for k in ("UserId", "Account", "Arn")},
+    }
+
+
 class AWSProvider:
     def __init__(self, region: str = "us-east-1", profile: Optional[str] = None):
         self.region = region
@@ -35,10 +89,10 @@ class AWSProvider:
         Synchronous status check -- called via asyncio.to_thread().
 
         Authentication logic:
-          1. shutil.which("aws") -> installed
-          2. aws sts get-caller-identity --output json
-             -> exit code 0 -> authenticated
-             -> Parse Account field from JSON stdout
+          1. aws_installed() (aws CLI or boto3) -> installed
+          2. STS GetCallerIdentity (boto3, else the aws CLI)
+             -> success -> authenticated
+             -> Account / Arn from the response
         """
         status: Dict[str, Any] = {
             "installed": False,
@@ -49,17 +103,23 @@ class AWSProvider:
         }
 
         # -- 1. Installation check --
-        aws_path = shutil.which("aws")
-        if not aws_path:
+        aws_path = which_cached("aws")
+        if not aws_installed():
             status["error"] = "AWS CLI not found on PATH"
             status["debug"]["which"] = None
             return status
+        has_boto3 = _has_boto3()
         status["installed"] = True
         status["debug"]["which"] = aws_path
-
-        # -- 2. Authentication check via STS --
-        sts_cmd = "aws sts get-caller-identity --output json"
-        sts = run_cli(sts_cmd, tag="AWS")
+        status["debug"]["via"] = "boto3" if has_boto3 else "cli"
+
+        # -- 2. Authentication check via STS (SDK call: no process spawn) --
+        sts = cached_identity(
+            "aws",
+            self.profile,
+            self.region,
+            fetch=_sts_identity if has_boto3 else None,
+        )
         status["debug"]["sts"] = {
             "stdout": sts["stdout"][:300],
             "stderr": sts["stderr"][:300],
@@ -69,7 +129,7 @@ class AWSProvider:
         if sts["ok"]:
             # CLI exit code 0 -> authenticated
             status["authenticated"] = True
-            parsed = parse_json(sts["stdout"])
+            parsed = sts["identity"]
             if isinstance(parsed, dict):
                 status["account"] = parsed.get("Account")
                 status["debug"]["arn"] = parsed.get("Arn", "")
@@ -88,7 +148,7 @@ class AWSProvider:
         return status
 
     async def get_status(self) -> Dict[str, Any]:
-        """Async wrapper -- runs blocking subprocess in a thread."""
+        """Async wrapper -- runs the blocking STS lookup in a thread."""
         return await asyncio.to_thread(self.get_status_sync)
 
     async def get_costs(self, days: int = 30) -> List[NormalizedCost]:
@@ -99,7 +159,7 @@ class AWSProvider:
 
     async def get_infrastructure(self) -> List[Resource]:
         """Discovers infrastructure using modular collectors."""
-        if not HAS_BOTO3:
+        if not _has_boto3():
             return []
 
         from ..collectors.aws.ec2 import EC2Collector
@@ -131,7 +191,7 @@ class AWSProvider:
     async def get_utilization_metrics(
         self, resources: List[Resource], period_days: int = 7
     ) -> List[Resource]:
-        if not HAS_BOTO3:
+        if not _has_boto3():
             return resources
         from ..collectors.aws.metrics import AWSMetricsCollector
 
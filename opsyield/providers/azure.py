@@ -1,34 +1,57 @@
 """
 Azure Provider — Production-grade cloud status detection.
 
-Uses subprocess.run(shell=True) for Windows .cmd compatibility.
+Runs the az CLI as asyncio subprocesses via cli_utils.run_cli_async (no
+shell; .cmd shims resolved by shutil.which).
 Authentication is determined by CLI exit code of `az account show`.
 """
 
+import asyncio
 import os
-import shutil
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from ..core.models import NormalizedCost, Resource
 from ..core.logging import get_logger
-from .cli_utils import run_cli, parse_json
+from .cli_utils import (
+    cache_identity,
+    identity_cache,
+    which_cached,
+    run_cli_async,
+    run_sync,
+    parse_json,
+    iter_json_items,
+)
 
 logger = get_logger(__name__)
 
+_AZ_SHOW_ARGV = ("az", "account", "show", "--output", "json")
+_AZ_LIST_ARGV = ("az", "account", "list", "--output", "json")
+
+
+def _show_cache_key() -> tuple:
+    """identity_cache key for `az account show` (AZURE_CONFIG_DIR picks the login)."""
+    return ("azure", os.environ.get("AZURE_CONFIG_DIR"))
+
 
 class AzureProvider:
     def __init__(self, subscription_id: str = None):
         self.subscription_id = subscription_id
 
-    def get_status_sync(self) -> Dict[str, Any]:
+    async def get_status(self) -> Dict[str, Any]:
         """
-        Synchronous status check -- called via asyncio.to_thread().
+        Async status check -- az runs as asyncio subprocesses.
 
         Authentication logic:
-          1. shutil.which("az") -> installed
-          2. az account show --output json
+          1. which_cached("az") -> installed
+          2. az account show --output json (reused for 60s once it succeeds)
              -> exit code 0 -> authenticated
              -> Parse id (subscription), name, user from JSON stdout
+          3. Fallback: az account list --output json
+             -> any subscription -> authenticated
+
+        When `show` is not cached the fallback starts alongside it, so a
+        failed `show` costs no extra wall-clock; the list is cancelled (child
+        killed) as soon as `show` succeeds.
         """
         status: Dict[str, Any] = {
             "installed": False,
@@ -39,7 +62,7 @@ class AzureProvider:
         }
 
         # -- 1. Installation check --
-        az_path = shutil.which("az")
+        az_path = which_cached("az")
         if not az_path:
             status["error"] = "Azure CLI not found on PATH"
             status["debug"]["which"] = None
@@ -48,8 +71,19 @@ class AzureProvider:
         status["debug"]["which"] = az_path
 
         # -- 2. Authentication check via az account show --
-        show_cmd = "az account show --output json"
-        show = run_cli(show_cmd, tag="AZ")
+        list_task: Optional[asyncio.Task] = None
+        show = identity_cache.get(_show_cache_key())
+        if show is None:
+            list_task = asyncio.create_task(run_cli_async(_AZ_LIST_ARGV, tag="AZ"))
+            try:
+                show = await run_cli_async(_AZ_SHOW_ARGV, tag="AZ")
+            except BaseException:
+                list_task.cancel()
+                raise
+            cache_identity(_show_cache_key(), show)
+            if show["ok"]:
+                list_task.cancel()
+
         status["debug"]["account_show"] = {
             "stdout": show["stdout"][:400],
             "stderr": show["stderr"][:300],
@@ -59,7 +93,7 @@ class AzureProvider:
         if show["ok"]:
             # CLI exit code 0 -> authenticated
             status["authenticated"] = True
-            parsed = parse_json(show["stdout"])
+            parsed = parse_json(show["stdout_bytes"])
             if isinstance(parsed, dict):
                 sub_id = parsed.get("id", "")
                 sub_name = parsed.get("name", "")
@@ -73,23 +107,31 @@ class AzureProvider:
                 status["debug"]["user"] = user_info.get("name", "")
                 status["debug"]["tenant"] = parsed.get("tenantId", "")
         else:
-            # Fallback: try az account list
-            list_cmd = "az account list --output json"
-            acct_list = run_cli(list_cmd, tag="AZ")
+            # Fallback: az account list (already running alongside show)
+            if list_task is not None:
+                acct_list = await list_task
+            else:
+                acct_list = await run_cli_async(_AZ_LIST_ARGV, tag="AZ")
             status["debug"]["account_list"] = {
                 "returncode": acct_list["returncode"],
-                "stdout_len": len(acct_list["stdout"]),
+                "stdout_len": len(acct_list["stdout_bytes"]),
+                "truncated": acct_list["truncated"],
             }
 
             if acct_list["ok"]:
-                parsed_list = parse_json(acct_list["stdout"])
-                if isinstance(parsed_list, list) and len(parsed_list) > 0:
+                any_accounts = False
+                enabled = []
+                for a in iter_json_items(acct_list["stdout_bytes"]):
+                    any_accounts = True
+                    if isinstance(a, dict) and a.get("state") == "Enabled":
+                        enabled.append(
+                            {"id": a.get("id", ""), "name": a.get("name", "")}
+                        )
+                # A listing cut off at the output cap may yield no complete
+                # entries (no ijson), but it only gets that long with accounts.
+                if any_accounts or acct_list["truncated"]:
                     status["authenticated"] = True
-                    status["subscriptions"] = [
-                        {"id": a.get("id", ""), "name": a.get("name", "")}
-                        for a in parsed_list
-                        if isinstance(a, dict) and a.get("state") == "Enabled"
-                    ]
+                    status["subscriptions"] = enabled
                     if status["subscriptions"] and not self.subscription_id:
                         self.subscription_id = status["subscriptions"][0]["id"]
                 else:
@@ -104,11 +146,9 @@ class AzureProvider:
 
         return status
 
-    async def get_status(self) -> Dict[str, Any]:
-        """Async wrapper -- runs blocking subprocess in a thread."""
-        import asyncio
-
-        return await asyncio.to_thread(self.get_status_sync)
+    def get_status_sync(self) -> Dict[str, Any]:
+        """Blocking wrapper around get_status() for non-async callers."""
+        return run_sync(self.get_status)
 
     async def get_costs(self, days: int = 30) -> List[NormalizedCost]:
         from ..billing.azure import AzureBillingProvider
@@ -130,8 +170,6 @@ class AzureProvider:
             AzureSQLCollector(subscription_id=self.subscription_id),
         ]
 
-        import asyncio
-
         results = await asyncio.gather(
             *[c.collect() for c in collectors], return_exceptions=True
         )
@@ -3,66 +3,364 @@ Shared CLI utilities for cloud provider status checks.
 
 Extracted from individual provider modules to eliminate duplication.
 Used by: gcp.py, aws.py, azure.py for subprocess-based CLI interactions.
+
+Commands run without a shell: the executable is resolved with shutil.which
+(which also finds Windows .cmd shims) and exec'd directly.
 """
 
-import json
+import asyncio
+import io
 import os
+import shlex
+import shutil
 import subprocess
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import lru_cache
+from typing import (
+    Callable,
+    Coroutine,
+    Dict,
+    Any,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+try:
+    import ijson  # type: ignore[import]  # optional, no stubs
+
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 from ..core.logging import get_logger
+from ..utils.cache import TTLCache
+from ..utils.helpers import json_loads
 
 logger = get_logger(__name__)
 
+Command = Union[str, Sequence[str]]
+T = TypeVar("T")
+
+# iter_json_items() streams arrays larger than this when ijson is installed.
+_STREAM_THRESHOLD = 8192
+
+# run_cli_async() stops reading (and kills the CLI) past this much output.
+MAX_STDOUT = 256 * 1024
+_READ_CHUNK = 64 * 1024
 
-def clean_env() -> dict:
-    """Strip PAGER (breaks CLIs on Windows) and return env copy."""
+
+def clean_env() -> Optional[dict]:
+    """
+    Environment for CLI children, with PAGER stripped (breaks CLIs on Windows).
+
+    Returns None — inherit os.environ, no copy — when PAGER is not set, which
+    is the common case; also never goes stale when the env changes at runtime.
+    """
+    if "PAGER" not in os.environ:
+        return None
     env = os.environ.copy()
-    env.pop("PAGER", None)
+    del env["PAGER"]
     return env
 
 
-def run_cli(cmd: str, timeout: int = 15, tag: str = "CLI") -> Dict[str, Any]:
+@lru_cache(maxsize=8)
+def _which(binary: str, path: Optional[str]) -> Optional[str]:
+    return shutil.which(binary, path=path)
+
+
+def which_cached(binary: str) -> Optional[str]:
+    """
+    shutil.which() memoized per (binary, PATH): the lookup stats every PATH
+    entry (times PATHEXT on Windows) and the answer rarely changes.
+    """
+    return _which(binary, os.environ.get("PATH"))
+
+
+def _argv(cmd: Command) -> List[str]:
+    """Split a command and resolve its executable to an absolute path."""
+    argv = shlex.split(cmd) if isinstance(cmd, str) else list(cmd)
+    exe = which_cached(argv[0])
+    if exe:
+        argv[0] = exe
+    return argv
+
+
+def _failed(stderr: str) -> Dict[str, Any]:
+    return {
+        "ok": False,
+        "stdout": "",
+        "stdout_bytes": b"",
+        "stderr": stderr,
+        "returncode": -1,
+        "truncated": False,
+    }
+
+
+def _result(
+    cmd: Command,
+    tag: str,
+    out: bytes,
+    err: bytes,
+    rc: int,
+    truncated: bool = False,
+    ok: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Build the run_cli() result. stdout_bytes is the raw output, for
+    parse_json() (orjson reads bytes as-is; JSON ignores surrounding
+    whitespace). stdout is decoded but not stripped — callers that need
+    trimmed text strip it — and stderr (short) is decoded and stripped.
+    ok defaults to rc == 0.
+    """
+    # %-style args: formatted only if a handler actually emits the record.
+    logger.info(
+        "[%s] cmd=%r rc=%s stdout=%dB stderr=%dB%s",
+        tag,
+        cmd,
+        rc,
+        len(out),
+        len(err),
+        " (truncated)" if truncated else "",
+    )
+    return {
+        "ok": rc == 0 if ok is None else ok,
+        "stdout": out.decode("utf-8", errors="replace"),
+        "stdout_bytes": out,
+        "stderr": err.decode("utf-8", errors="replace").strip(),
+        "returncode": rc,
+        "truncated": truncated,
+    }
+
+
+def run_cli(cmd: Command, timeout: int = 15, tag: str = "CLI") -> Dict[str, Any]:
     """
     Run a CLI command synchronously with full debug capture.
 
-    Returns {ok, stdout, stderr, returncode} — never raises.
+    Returns {ok, stdout, stdout_bytes, stderr, returncode, truncated} —
+    never raises. truncated is always False here (output is unbounded).
     """
     try:
         result = subprocess.run(
-            cmd,
+            _argv(cmd),
             capture_output=True,
-            text=True,
-            shell=True,
             timeout=timeout,
             env=clean_env(),
         )
-        logger.info(
-            f"[{tag}] cmd={cmd!r} rc={result.returncode} "
-            f"stdout={len(result.stdout)}B stderr={len(result.stderr)}B"
-        )
-        return {
-            "ok": result.returncode == 0,
-            "stdout": result.stdout.strip(),
-            "stderr": result.stderr.strip(),
-            "returncode": result.returncode,
-        }
+        return _result(cmd, tag, result.stdout, result.stderr, result.returncode)
     except subprocess.TimeoutExpired:
-        logger.warning(f"[{tag}] Timeout: {cmd}")
-        return {
-            "ok": False,
-            "stdout": "",
-            "stderr": "Command timed out",
-            "returncode": -1,
-        }
+        logger.warning("[%s] Timeout: %s", tag, cmd)
+        return _failed("Command timed out")
     except Exception as e:
-        logger.error(f"[{tag}] Exception: {e}")
-        return {"ok": False, "stdout": "", "stderr": str(e), "returncode": -1}
+        logger.error("[%s] Exception: %s", tag, e)
+        return _failed(str(e))
+
+
+async def _read_bounded(stream: asyncio.StreamReader, limit: int) -> Tuple[bytes, bool]:
+    """Read to EOF or until more than `limit` bytes; returns (data, truncated)."""
+    chunks: List[bytes] = []
+    size = 0
+    while True:
+        chunk = await stream.read(_READ_CHUNK)
+        if not chunk:
+            return b"".join(chunks), False
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            return b"".join(chunks)[:limit], True
 
 
-def parse_json(raw: str) -> Optional[Any]:
-    """Safely parse JSON, return None on failure."""
+async def _communicate(
+    proc: asyncio.subprocess.Process, limit: int
+) -> Tuple[bytes, bytes, bool, bool, int]:
+    """
+    proc.communicate() with both pipes capped at `limit` bytes.
+
+    Returns (stdout, stderr, stdout_truncated, stderr_truncated, returncode).
+    """
+    assert proc.stdout is not None and proc.stderr is not None  # both PIPE
+
+    async def bounded(stream: asyncio.StreamReader) -> Tuple[bytes, bool]:
+        data, truncated = await _read_bounded(stream, limit)
+        if truncated:
+            # Nobody will read the rest, and a full pipe would block the CLI
+            # (and so the other stream's EOF): stop it instead of draining.
+            with suppress(ProcessLookupError):
+                proc.kill()
+        return data, truncated
+
+    (out, out_truncated), (err, err_truncated) = await asyncio.gather(
+        bounded(proc.stdout), bounded(proc.stderr)
+    )
+    rc = await proc.wait()
+    return out, err, out_truncated, err_truncated, rc
+
+
+async def run_cli_async(
+    cmd: Command,
+    timeout: float = 15,
+    tag: str = "CLI",
+    max_bytes: int = MAX_STDOUT,
+) -> Dict[str, Any]:
+    """
+    Async run_cli(): the child is awaited on the event loop, not a worker
+    thread, so concurrent status checks are not capped by the thread pool.
+
+    At most max_bytes of stdout and of stderr are kept; past that on either
+    stream the CLI is killed and the result has truncated=True. A CLI killed
+    for too much stdout still counts as ok (its exit code is the kill's):
+    callers of list commands get the first max_bytes of a successful listing.
+
+    Returns {ok, stdout, stdout_bytes, stderr, returncode, truncated} —
+    never raises.
+    """
     try:
-        return json.loads(raw) if raw else None
-    except json.JSONDecodeError:
+        proc = await asyncio.create_subprocess_exec(
+            *_argv(cmd),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=clean_env(),
+        )
+    except Exception as e:  # noqa: BLE001 - never raises, like run_cli()
+        logger.error("[%s] Exception: %s", tag, e)
+        return _failed(str(e))
+
+    try:
+        out, err, out_truncated, err_truncated, rc = await asyncio.wait_for(
+            _communicate(proc, max_bytes), timeout
+        )
+    except asyncio.TimeoutError:
+        with suppress(ProcessLookupError):
+            proc.kill()
+        await proc.wait()
+        logger.warning("[%s] Timeout: %s", tag, cmd)
+        return _failed("Command timed out")
+    except asyncio.CancelledError:
+        # Caller no longer wants the result (e.g. a losing fallback): don't
+        # leave the CLI running behind us.
+        with suppress(ProcessLookupError):
+            proc.kill()
+        await proc.wait()
+        raise
+
+    return _result(
+        cmd,
+        tag,
+        out,
+        err,
+        rc,
+        out_truncated or err_truncated,
+        ok=rc == 0 or out_truncated,
+    )
+
+
+def run_sync(make_coro: Callable[[], Coroutine[Any, Any, T]]) -> T:
+    """
+    Run make_coro() to completion from synchronous code (get_status_sync).
+
+    asyncio.run() refuses to start inside a running loop, e.g. when a sync
+    helper is called from a FastAPI or MCP handler; there the coroutine runs
+    on a private loop in a worker thread, blocking the caller as any sync
+    call would.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(make_coro())
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(lambda: asyncio.run(make_coro())).result()
+
+
+def parse_json(raw: Union[str, bytes]) -> Optional[Any]:
+    """Safely parse JSON (orjson when installed), return None on failure."""
+    try:
+        return json_loads(raw) if raw else None
+    except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError
         return None
+
+
+def iter_json_items(raw: bytes) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array; nothing if `raw` is not one.
+
+    Large outputs (e.g. `az account list` across hundreds of subscriptions)
+    are streamed with ijson when installed, so only one element is alive at
+    a time; otherwise, or for small outputs, this is parse_json().
+    """
+    if HAS_IJSON and len(raw) > _STREAM_THRESHOLD:
+        try:
+            yield from ijson.items(io.BytesIO(raw), "item")
+        except ijson.JSONError:
+            return
+        return
+    parsed = parse_json(raw)
+    if isinstance(parsed, list):
+        yield from parsed
+
+
+# ─────────────────────────────────────────────────────────────
+# Cached identity lookups (STS)
+# ─────────────────────────────────────────────────────────────
+
+_IDENTITY_TTL_S = 60
+
+# Successful identity lookups (AWS STS, `az account show`), shared by the
+# providers. Failures are never stored, so a fresh `aws sso login` or
+# `az login` is picked up on the very next check.
+identity_cache = TTLCache(ttl=_IDENTITY_TTL_S, maxsize=16)
+
+_IDENTITY_COMMANDS = {
+    "aws": ("aws", "sts", "get-caller-identity", "--output", "json"),
+}
+
+# Env vars that select which identity the CLI reports.
+_IDENTITY_ENV = {
+    "aws": ("AWS_PROFILE", "AWS_ACCESS_KEY_ID"),
+}
+
+
+IdentityFetcher = Callable[[Optional[str], Optional[str]], Dict[str, Any]]
+
+
+def cache_identity(key: tuple, result: Dict[str, Any]) -> None:
+    """Store an identity lookup in identity_cache, if it succeeded."""
+    if result["ok"]:
+        identity_cache.set(key, result)
+
+
+def cached_identity(
+    provider: str,
+    profile: Optional[str] = None,
+    region: Optional[str] = None,
+    fetch: Optional[IdentityFetcher] = None,
+) -> Dict[str, Any]:
+    """
+    Run the provider's identity command, reusing a successful result for up
+    to 60s.
+
+    Returns the run_cli() dict plus "identity" (parsed JSON or None). Keyed
+    on profile/region and the identity env vars, so switching AWS_PROFILE is
+    picked up immediately. Treat the result as read-only.
+
+    fetch(profile, region) replaces the CLI call (e.g. an SDK lookup) and
+    must return the same shape.
+    """
+    env = tuple(os.environ.get(k) for k in _IDENTITY_ENV[provider])
+    key = (provider, profile, region, env)
+    result = identity_cache.get(key)
+    if result is not None:
+        return result
+    if fetch is not None:
+        result = fetch(profile, region)
+    else:
+        result = run_cli(_IDENTITY_COMMANDS[provider], tag=provider.upper())
+        result["identity"] = (
+            parse_json(result["stdout_bytes"]) if result["ok"] else None
+        )
+    cache_identity(key, result)
+    return result
@@ -4,21 +4,29 @@ ProviderFactory — Concurrent cloud status with timeout guards.
 Architecture:
   1. Instantiate all providers
   2. Fire all get_status() in parallel via asyncio.gather()
-  3. Each provider internally uses asyncio.to_thread(subprocess.run)
+  3. Providers await asyncio subprocesses / SDK calls (off-loop threads)
   4. Outer safe_status() adds a 20s hard timeout per provider
   5. 60s TTL in-memory cache prevents repeated CLI calls
+  6. The same TTL on disk (sqlite) spans short-lived MCP/CLI processes
 """
 
 import asyncio
+import hashlib
 import time
 import os
 import inspect
-from typing import Dict, Type, Any
+import socket
+import sqlite3
+from contextlib import closing
+from functools import lru_cache
+from typing import Callable, Dict, Type, Any, Iterable, Optional, Tuple
 
 from ..core.logging import get_logger
+from ..utils.helpers import ensure_default_executor, json_dumps, json_loads
 from .base import CloudProvider
+from .cli_utils import which_cached
 from .gcp import GCPProvider
-from .aws import AWSProvider
+from .aws import AWSProvider, aws_installed
 from .azure import AzureProvider
 from .kubernetes import KubernetesProvider
 
@@ -29,13 +37,133 @@ logger = get_logger(__name__)
 # ─────────────────────────────────────────────────────────────
 
 _status_cache: Dict[str, Any] = {}
-_cache_timestamp: float = 0.0
 _CACHE_TTL: float = 60.0
-_cache_lock: asyncio.Lock | None = (
-    None  # Lazy-init to avoid binding to wrong event loop
+# Timer that drops _status_cache when its TTL runs out, and the loop that
+# owns it; a hit is just a truthiness check, no clock reads.
+_cache_expiry: asyncio.TimerHandle | None = None
+_cache_loop: asyncio.AbstractEventLoop | None = None
+# In-flight status check shared by concurrent callers (request coalescing).
+_status_task: asyncio.Task | None = None
+
+
+def _expire_status_cache() -> None:
+    global _status_cache, _cache_expiry
+    _status_cache = {}
+    _cache_expiry = None
+
+
+def _store_status_cache(statuses: Dict[str, Any], ttl: float) -> None:
+    """Cache statuses and schedule their expiry on the running loop."""
+    global _status_cache, _cache_expiry, _cache_loop
+    if _cache_expiry is not None:
+        _cache_expiry.cancel()
+    _status_cache = statuses
+    _cache_loop = asyncio.get_running_loop()
+    _cache_expiry = _cache_loop.call_later(ttl, _expire_status_cache)
+
+
+def _clear_status_task(task: asyncio.Task) -> None:
+    global _status_task
+    if _status_task is task:
+        _status_task = None
+
+
+# ─────────────────────────────────────────────────────────────
+# On-disk status cache (shared across processes, same TTL)
+# ─────────────────────────────────────────────────────────────
+
+# Env vars that change what the provider CLIs report.
+_STATUS_ENV = (
+    "PATH",
+    "AWS_PROFILE",
+    "AWS_ACCESS_KEY_ID",
+    "AZURE_CONFIG_DIR",
+    "CLOUDSDK_CONFIG",
+    "GOOGLE_APPLICATION_CREDENTIALS",
+    "KUBECONFIG",
 )
 
 
+def _status_cache_path() -> Optional[str]:
+    """
+    On-disk status cache location, from OPSYIELD_STATUS_CACHE; off unless
+    set. Lets short-lived MCP processes skip the CLI fan-out on start-up.
+    """
+    path = os.environ.get("OPSYIELD_STATUS_CACHE")
+    return os.path.expanduser(path) if path else None
+
+
+def _persistable_status(statuses: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    statuses without the per-provider "debug" blocks and the _meta env
+    snapshot: those hold CLI output (account JSON, user, tenant id) that
+    has no business on disk.
+    """
+    out: Dict[str, Any] = {}
+    for name, status in statuses.items():
+        if isinstance(status, dict):
+            drop = "env" if name == "_meta" else "debug"
+            status = {k: v for k, v in status.items() if k != drop}
+        out[name] = status
+    return out
+
+
+def _status_cache_key(provider_names: Iterable[str]) -> str:
+    """Scopes an entry to (uid, hostname), the provider set and _STATUS_ENV."""
+    uid = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME")
+    env = tuple(os.environ.get(k) for k in _STATUS_ENV)
+    raw = repr((uid, socket.gethostname(), tuple(provider_names), env))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    created = not os.path.exists(path)
+    conn = sqlite3.connect(path, timeout=1.0)
+    if created:
+        os.chmod(path, 0o600)  # WAL/SHM side files inherit the mode
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS cache "
+        "(key TEXT PRIMARY KEY, payload BLOB, expires_at REAL)"
+    )
+    return conn
+
+
+def _load_disk_status(path: str, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+    """Return (statuses, expires_at_epoch) if a fresh entry exists. Blocking."""
+    try:
+        with closing(_connect(path)) as conn:
+            row = conn.execute(
+                "SELECT payload, expires_at FROM cache WHERE key=? AND expires_at>?",
+                (key, time.time()),
+            ).fetchone()
+        return (json_loads(row[0]), row[1]) if row else None
+    except (OSError, sqlite3.Error, ValueError) as e:
+        logger.debug("Could not read status cache %s: %s", path, e)
+        return None
+
+
+def _save_disk_status(path: str, key: str, statuses: Dict[str, Any]) -> None:
+    """Upsert the entry and drop expired ones. Blocking."""
+    now = time.time()
+    try:
+        with closing(_connect(path)) as conn, conn:
+            conn.execute("DELETE FROM cache WHERE expires_at<=?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, payload, expires_at) VALUES (?, ?, ?)",
+                (
+                    key,
+                    json_dumps(_persistable_status(statuses), default=str),
+                    now + _CACHE_TTL,
+                ),
+            )
+    except (OSError, sqlite3.Error, TypeError) as e:
+        logger.debug("Could not persist status cache to %s: %s", path, e)
+
+
 # ─────────────────────────────────────────────────────────────
 # Safe async execution wrapper
 # ─────────────────────────────────────────────────────────────
@@ -62,7 +190,7 @@ async def safe_status(
         return result
 
     except asyncio.TimeoutError:
-        logger.warning(f"Provider '{name}' timed out after {timeout}s")
+        logger.warning("Provider '%s' timed out after %ss", name, timeout)
         return {
             "installed": True,
             "authenticated": False,
@@ -71,7 +199,7 @@ async def safe_status(
         }
 
     except Exception as e:
-        logger.error(f"Provider '{name}' failed: {e}")
+        logger.error("Provider '%s' failed: %s", name, e)
         return {
             "installed": False,
             "authenticated": False,
@@ -98,6 +226,101 @@ def _get_env_snapshot() -> dict:
     }
 
 
+# ─────────────────────────────────────────────────────────────
+# No-credentials fast path
+# ─────────────────────────────────────────────────────────────
+
+# (CLI binary, env vars, config paths). With none of the env vars set and
+# none of the paths present the provider cannot be authenticated, so its
+# status check (a CLI fork) is skipped — the common CI/dev-container case.
+_CREDENTIAL_HINTS: Dict[str, Tuple[str, Tuple[str, ...], Tuple[str, ...]]] = {
+    "aws": (
+        "aws",
+        (
+            "AWS_PROFILE",
+            "AWS_ACCESS_KEY_ID",
+            "AWS_WEB_IDENTITY_TOKEN_FILE",
+            "AWS_CONTAINER_CREDENTIALS_RELATIVE_URI",
+            "AWS_CONTAINER_CREDENTIALS_FULL_URI",
+            "AWS_SHARED_CREDENTIALS_FILE",
+            "AWS_CONFIG_FILE",
+        ),
+        ("~/.aws",),
+    ),
+    "azure": ("az", ("AZURE_CONFIG_DIR",), ("~/.azure",)),
+    "gcp": (
+        "gcloud",
+        ("CLOUDSDK_CONFIG", "GOOGLE_APPLICATION_CREDENTIALS"),
+        ("~/.config/gcloud", "%APPDATA%/gcloud"),
+    ),
+}
+
+# Providers whose "installed" is not just their CLI binary on PATH; keeps the
+# fast path's answer identical to the provider's own get_status().
+_INSTALLED_CHECKS: Dict[str, Callable[[], bool]] = {"aws": aws_installed}
+
+# DMI vendor strings of clouds whose VMs get credentials from a metadata
+# server (instance roles / service accounts) without any local config.
+_CLOUD_VM_VENDORS = ("Amazon", "Google", "Microsoft")
+
+
+@lru_cache(maxsize=1)
+def _on_cloud_vm() -> bool:
+    for name in ("sys_vendor", "product_name"):
+        try:
+            with open(f"/sys/class/dmi/id/{name}") as f:
+                value = f.read()
+        except OSError:
+            continue
+        if any(vendor in value for vendor in _CLOUD_VM_VENDORS):
+            return True
+    return False
+
+
+def _no_credentials_status(name: str) -> Optional[Dict[str, Any]]:
+    """
+    A "not authenticated" status when `name` clearly has no credentials
+    configured, else None (run the real check). Never short-circuits on
+    cloud VMs or for providers without _CREDENTIAL_HINTS.
+    """
+    hints = _CREDENTIAL_HINTS.get(name)
+    if hints is None:
+        return None
+    binary, env_vars, paths = hints
+    if any(os.environ.get(k) for k in env_vars):
+        return None
+    if any(os.path.exists(os.path.expanduser(os.path.expandvars(p))) for p in paths):
+        return None
+    if _on_cloud_vm():
+        return None
+    installed = _INSTALLED_CHECKS.get(name)
+    return {
+        "installed": installed() if installed else which_cached(binary) is not None,
+        "authenticated": False,
+        "error": "No credentials configured",
+        "debug": {"skipped": "no credential env vars or config files"},
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Provider construction (kwargs filtering + instance pool)
+# ─────────────────────────────────────────────────────────────
+
+
+@lru_cache(maxsize=None)
+def _accepted_kwargs(provider_class: Type[CloudProvider]) -> frozenset:
+    """Constructor parameter names, introspected once per provider class."""
+    return frozenset(inspect.signature(provider_class.__init__).parameters)
+
+
+@lru_cache(maxsize=32)
+def _pooled_provider(
+    provider_class: Type[CloudProvider], kwargs_key: tuple
+) -> CloudProvider:
+    """One shared instance per (class, constructor kwargs)."""
+    return provider_class(**dict(kwargs_key))
+
+
 # ─────────────────────────────────────────────────────────────
 # Provider Factory
 # ─────────────────────────────────────────────────────────────
@@ -134,13 +357,18 @@ class ProviderFactory:
         if not provider_class:
             raise ValueError(f"Unknown provider: {provider_name}")
 
-        # Inspect constructor signature
-        sig = inspect.signature(provider_class.__init__)
-
         # Filter kwargs safely
-        accepted_kwargs = {k: v for k, v in kwargs.items() if k in sig.parameters}
-
-        return provider_class(**accepted_kwargs)
+        accepted = _accepted_kwargs(provider_class)
+        accepted_kwargs = {k: v for k, v in kwargs.items() if k in accepted}
+
+        # Reuse instances across requests; unhashable kwargs (e.g. a
+        # config dict) get a fresh instance as before.
+        kwargs_key = tuple(sorted(accepted_kwargs.items()))
+        try:
+            hash(kwargs_key)
+        except TypeError:
+            return provider_class(**accepted_kwargs)
+        return _pooled_provider(provider_class, kwargs_key)
 
     @classmethod
     async def get_all_statuses(cls) -> Dict[str, Any]:
@@ -156,74 +384,105 @@ class ProviderFactory:
         }
         """
 
-        global _status_cache, _cache_timestamp, _cache_lock
-
-        if _cache_lock is None:
-            _cache_lock = asyncio.Lock()
-
-        async with _cache_lock:
-            now = time.monotonic()
+        global _status_task
 
-            # Cache hit
-            if _status_cache and (now - _cache_timestamp) < _CACHE_TTL:
-                logger.info("Returning cached cloud status")
-                return _status_cache
+        ensure_default_executor()
 
-            # Docker awareness
-            if os.path.exists("/.dockerenv"):
-                logger.warning(
-                    "Running inside Docker — host credentials may not be mounted"
-                )
+        # Cache hit. The expiry timer only fires while its loop runs, so an
+        # entry cached under another (e.g. asyncio.run) loop is not trusted.
+        loop = asyncio.get_running_loop()
+        if _status_cache and _cache_loop is loop:
+            logger.info("Returning cached cloud status")
+            return _status_cache
 
-            t0 = time.monotonic()
+        # Join a check already running on this loop instead of queueing
+        # behind it; shield so one caller's cancellation doesn't abort it.
+        task = _status_task
+        if task is None or task.get_loop() is not loop:
+            task = _status_task = asyncio.ensure_future(cls._check_all_statuses())
+            task.add_done_callback(_clear_status_task)
+        return await asyncio.shield(task)
 
-            provider_names = list(cls._providers.keys())
-            instances = []
-
-            # Instantiate providers
-            for name in provider_names:
-                try:
-                    instances.append(cls._providers[name]())
-                except Exception as e:
-                    logger.error(f"Failed to instantiate '{name}': {e}")
-                    instances.append(None)
-
-            # Prepare async tasks
-            tasks = []
-            for name, inst in zip(provider_names, instances):
-                if inst is not None:
-                    tasks.append(safe_status(name, inst, timeout=20.0))
-                else:
-
-                    async def _fail(n=name):
-                        return {
-                            "installed": False,
-                            "authenticated": False,
-                            "error": f"Failed to instantiate {n}",
-                        }
-
-                    tasks.append(_fail())
-
-            # Run concurrently
-            results = await asyncio.gather(*tasks, return_exceptions=False)
-
-            elapsed = time.monotonic() - t0
-
-            # Build response
-            statuses: Dict[str, Any] = {}
-
-            for name, result in zip(provider_names, results):
-                statuses[name] = result
-
-            statuses["_meta"] = {
-                "elapsed_ms": round(elapsed * 1000),
-                "env": _get_env_snapshot(),
-            }
+    @classmethod
+    async def _check_all_statuses(cls) -> Dict[str, Any]:
+        """
+        Run every provider's status check concurrently and cache the result,
+        unless another process stored a fresh one in the on-disk cache.
+        """
+        provider_names = list(cls._providers.keys())
+        path = _status_cache_path()
+        key = _status_cache_key(provider_names) if path else ""
+        if path:
+            hit = await asyncio.to_thread(_load_disk_status, path, key)
+            if hit is not None:
+                cached, expires_at = hit
+                # Expire the in-memory entry with the disk entry.
+                _store_status_cache(cached, expires_at - time.time())
+                logger.info("Returning cloud status from disk cache")
+                return cached
+
+        # Docker awareness
+        if os.path.exists("/.dockerenv"):
+            logger.warning(
+                "Running inside Docker — host credentials may not be mounted"
+            )
+
+        t0 = time.monotonic()
+
+        instances = []
+
+        # Instantiate providers
+        for name in provider_names:
+            try:
+                instances.append(cls._providers[name]())
+            except Exception as e:
+                logger.error("Failed to instantiate '%s': %s", name, e)
+                instances.append(None)
+
+        # Prepare async tasks
+        tasks = []
+        for name, inst in zip(provider_names, instances):
+            skipped = _no_credentials_status(name)
+            if skipped is not None:
+
+                async def _skip(result=skipped):
+                    return result
+
+                tasks.append(_skip())
+            elif inst is not None:
+                tasks.append(safe_status(name, inst, timeout=20.0))
+            else:
+
+                async def _fail(n=name):
+                    return {
+                        "installed": False,
+                        "authenticated": False,
+                        "error": f"Failed to instantiate {n}",
+                    }
+
+                tasks.append(_fail())
+
+        # Run concurrently
+        results = await asyncio.gather(*tasks, return_exceptions=False)
+
+        elapsed = time.monotonic() - t0
+
+        # Build response
+        statuses: Dict[str, Any] = {}
+
+        for name, result in zip(provider_names, results):
+            statuses[name] = result
+
+        statuses["_meta"] = {
+            "elapsed_ms": round(elapsed * 1000),
+            "env": _get_env_snapshot(),
+        }
 
-            # Update cache
-            _status_cache = statuses
-            _cache_timestamp = time.monotonic()
+        # Update cache
+        _store_status_cache(statuses, _CACHE_TTL)
+        if path:
+            await asyncio.to_thread(_save_disk_status, path, key, statuses)
 
-            logger.info(f"Cloud status checked in {elapsed:.2f}s: {provider_names}")
+        logger.info("Cloud status checked in %.2fs: %s", elapsed, provider_names)
 
-            return statuses
+        return statuses
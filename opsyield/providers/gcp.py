@@ -1,24 +1,29 @@
 """
 GCP Provider — Production-grade cloud status + cost analysis.
 
-Status: subprocess.run(shell=True) for Windows .cmd compatibility.
-Costs:  google-cloud-bigquery billing export with asyncio.to_thread().
+Status: gcloud via asyncio subprocesses (cli_utils.run_cli_async).
+Costs:  BigQuery billing export via the async REST API (see billing/gcp.py).
 Authentication is determined by CLI exit code, NOT by project list.
 """
 import asyncio
 import os
-import shutil
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import List, Dict, Any, Optional
 
 from ..core.models import NormalizedCost, Resource
 from ..core.logging import get_logger
-from .cli_utils import run_cli, parse_json
+from .cli_utils import which_cached, run_cli_async, run_sync, iter_json_items
 
 logger = get_logger(__name__)
 
+_GCLOUD_AUTH_LIST_ARGV = (
+    "gcloud", "auth", "list", "--filter=status:ACTIVE", "--format=value(account)"
+)
+_GCLOUD_ADC_TOKEN_ARGV = ("gcloud", "auth", "application-default", "print-access-token")
+_GCLOUD_PROJECTS_ARGV = ("gcloud", "projects", "list", "--format=json")
+
 
 # ——— Lazy BigQuery imports (optional dependency) ———
 try:
@@ -47,21 +52,22 @@ class GCPProvider:
     _BQ_RESOURCE_TABLE_PATTERN = "gcp_billing_export_resource_v1_*"
 
     def __init__(self, project_id: str = None, credentials_path: str = None):
-        from ..core.context import get_project
-        self.project_id = (
-            project_id
-            or get_project()
-            or os.environ.get("GOOGLE_CLOUD_PROJECT")
-        )
+        self._project_id = project_id
         self.credentials_path = credentials_path
 
-    def _resolve_project_id(self) -> str:
+    @property
+    def project_id(self) -> Optional[str]:
+        # Resolved per access: ProviderFactory pools instances, and the
+        # active project (configure_project) may change between calls.
         from ..core.context import get_project
-        resolved = (
-            self.project_id
+        return (
+            self._project_id
             or get_project()
             or os.environ.get("GOOGLE_CLOUD_PROJECT")
         )
+
+    def _resolve_project_id(self) -> str:
+        resolved = self.project_id
         if not resolved:
             raise ValueError("No GCP project_id set")
         return resolved
@@ -70,12 +76,13 @@ class GCPProvider:
     # Status Detection (unchanged from previous version)
     # -------------------------------------------------
 
-    def get_status_sync(self) -> Dict[str, Any]:
+    async def get_status(self) -> Dict[str, Any]:
         """
-        Synchronous status check -- called via asyncio.to_thread().
+        Async status check -- gcloud runs as an asyncio subprocess, so the
+        event loop is never blocked and no worker thread is held.
 
         Authentication logic:
-          1. shutil.which("gcloud") -> installed
+          1. which_cached("gcloud") -> installed
           2. gcloud auth list --filter=status:ACTIVE --format=value(account)
              -> if exit code 0 AND stdout non-empty -> authenticated
           3. Fallback: gcloud auth application-default print-access-token
@@ -91,7 +98,7 @@ class GCPProvider:
         }
 
         # -- 1. Installation check --
-        gcloud_path = shutil.which("gcloud")
+        gcloud_path = which_cached("gcloud")
         if not gcloud_path:
             status["error"] = "gcloud CLI not found on PATH"
             status["debug"]["which"] = None
@@ -100,26 +107,26 @@ class GCPProvider:
         status["debug"]["which"] = gcloud_path
 
         # -- 2. Primary auth check --
-        auth_cmd = "gcloud auth list --filter=status:ACTIVE --format=value(account)"
-        auth = run_cli(auth_cmd, tag="GCP")
+        auth = await run_cli_async(_GCLOUD_AUTH_LIST_ARGV, tag="GCP")
         status["debug"]["auth_list"] = {
             "stdout": auth["stdout"][:200],
             "stderr": auth["stderr"][:200],
             "returncode": auth["returncode"],
         }
 
-        if auth["ok"] and auth["stdout"].strip():
+        accounts = auth["stdout"].strip() if auth["ok"] else ""
+        if accounts:
             status["authenticated"] = True
-            status["debug"]["active_account"] = auth["stdout"].strip().split("\n")[0]
+            status["debug"]["active_account"] = accounts.split("\n", 1)[0]
         else:
             # -- 3. Fallback: Application Default Credentials --
-            adc_cmd = "gcloud auth application-default print-access-token"
-            adc = run_cli(adc_cmd, timeout=10, tag="GCP")
+            adc = await run_cli_async(_GCLOUD_ADC_TOKEN_ARGV, timeout=10, tag="GCP")
+            has_token = bool(adc["stdout"].strip())
             status["debug"]["adc"] = {
                 "returncode": adc["returncode"],
-                "has_token": bool(adc["stdout"].strip()),
+                "has_token": has_token,
             }
-            if adc["ok"] and adc["stdout"].strip():
+            if adc["ok"] and has_token:
                 status["authenticated"] = True
                 status["debug"]["auth_method"] = "application-default"
             else:
@@ -127,24 +134,31 @@ class GCPProvider:
 
         # -- 4. Project list (informational, does NOT affect auth) --
         if status["authenticated"]:
-            proj = run_cli("gcloud projects list --format=json", tag="GCP")
+            proj = await run_cli_async(_GCLOUD_PROJECTS_ARGV, tag="GCP")
             status["debug"]["projects_list"] = {
                 "returncode": proj["returncode"],
-                "stdout_len": len(proj["stdout"]),
+                "stdout_len": len(proj["stdout_bytes"]),
+                "truncated": proj["truncated"],
             }
-            parsed = parse_json(proj["stdout"])
-            if isinstance(parsed, list):
-                status["projects"] = [
-                    {"id": p.get("projectId", ""), "name": p.get("name", "")}
-                    for p in parsed
-                    if p.get("lifecycleState") == "ACTIVE"
-                ]
+            # Streamed, so a listing cut off at the output cap still yields
+            # its complete leading entries (when ijson is installed).
+            status["projects"] = [
+                {"id": p.get("projectId", ""), "name": p.get("name", "")}
+                for p in iter_json_items(proj["stdout_bytes"])
+                if isinstance(p, dict) and p.get("lifecycleState") == "ACTIVE"
+            ]
+            if proj["truncated"]:
+                logger.warning(
+                    "[GCP] projects list truncated at %d bytes; %d projects kept",
+                    len(proj["stdout_bytes"]),
+                    len(status["projects"]),
+                )
 
         return status
 
-    async def get_status(self) -> Dict[str, Any]:
-        """Async wrapper -- runs blocking subprocess in a thread."""
-        return await asyncio.to_thread(self.get_status_sync)
+    def get_status_sync(self) -> Dict[str, Any]:
+        """Blocking wrapper around get_status() for non-async callers."""
+        return run_sync(self.get_status)
 
     # -------------------------------------------------
     # Cost Analysis via BigQuery Billing Export
@@ -161,12 +175,15 @@ class GCPProvider:
     # Resource-level costs (best-effort)
     # -------------------------------------------------
 
-    def _build_resource_cost_query(self, project_id: str, days: int) -> str:
+    def _build_resource_cost_query(self, project_id: str) -> str:
         """
         Build a BigQuery SQL query to estimate per-resource costs using the
-        resource-level billing export table (if enabled).
+        resource-level billing export table (if enabled). The window start is
+        the @start_date DATE parameter, so the text is stable across calls.
         """
-        start_date = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
+        from ..billing.gcp import validate_project_id
+
+        validate_project_id(project_id)
         table = f"`{project_id}.{self._BQ_DATASET}.{self._BQ_RESOURCE_TABLE_PATTERN}`"
 
         # Note: schema differs across exports; this is best-effort and errors are handled.
@@ -178,7 +195,7 @@ class GCPProvider:
                 SUM(cost) AS total_cost
             FROM {table}
             WHERE
-                DATE(usage_start_time) >= '{start_date}'
+                DATE(usage_start_time) >= @start_date
             GROUP BY
                 resource_key
             ORDER BY
@@ -198,11 +215,16 @@ class GCPProvider:
         except Exception:
             return {}
 
-        query = self._build_resource_cost_query(project_id, days)
-
         try:
+            query = self._build_resource_cost_query(project_id)
+            start_date = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter("start_date", "DATE", start_date)
+                ]
+            )
             client = bigquery.Client(project=project_id)
-            rows = list(client.query(query).result())
+            rows = list(client.query(query, job_config=job_config).result())
             out: Dict[str, Dict[str, Any]] = {}
             for row in rows:
                 key = row.get("resource_key")
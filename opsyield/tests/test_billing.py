@@ -0,0 +1,372 @@
+"""
+Tests for Billing Providers.
+"""
+
+import asyncio
+import os
+import stat
+import threading
+import time
+from datetime import datetime
+
+import httpx
+import pytest
+
+from opsyield.billing import gcp as gcp_billing
+from opsyield.billing.gcp import TokenCache, _parse_query_rows, _run_bq_query
+
+
+class TestGCPBilling:
+    def test_parse_query_rows(self):
+        data = {
+            "schema": {
+                "fields": [
+                    {"name": "service_name", "type": "STRING"},
+                    {"name": "total_cost", "type": "FLOAT"},
+                ]
+            },
+            "rows": [
+                {"f": [{"v": "Compute Engine"}, {"v": "12.5"}]},
+                {"f": [{"v": "BigQuery"}, {"v": "3.25"}]},
+            ],
+        }
+        rows = _parse_query_rows(data)
+        assert rows == [
+            {"service_name": "Compute Engine", "total_cost": "12.5"},
+            {"service_name": "BigQuery", "total_cost": "3.25"},
+        ]
+
+    def test_parse_query_rows_empty(self):
+        assert _parse_query_rows({"jobComplete": True}) == []
+
+    @pytest.mark.asyncio
+    async def test_run_bq_query_polls_until_complete(self, monkeypatch):
+        monkeypatch.setattr(gcp_billing, "_BQ_POLL_INTERVAL_S", 0)
+        schema = {"fields": [{"name": "service_name"}]}
+        polls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                return httpx.Response(
+                    200,
+                    json={
+                        "jobComplete": False,
+                        "jobReference": {"jobId": "job-1", "location": "US"},
+                    },
+                )
+            polls.append(request.url)
+            if request.url.params.get("pageToken"):
+                return httpx.Response(
+                    200, json={"jobComplete": True, "rows": [{"f": [{"v": "GCS"}]}]}
+                )
+            if len(polls) < 2:
+                return httpx.Response(200, json={"jobComplete": False})
+            return httpx.Response(
+                200,
+                json={
+                    "jobComplete": True,
+                    "schema": schema,
+                    "rows": [{"f": [{"v": "BigQuery"}]}],
+                    "pageToken": "next",
+                },
+            )
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            data = await _run_bq_query(client, "proj", {"query": "SELECT 1"})
+
+        assert polls[0].path.endswith("/projects/proj/queries/job-1")
+        assert polls[0].params["location"] == "US"
+        assert _parse_query_rows(data) == [
+            {"service_name": "BigQuery"},
+            {"service_name": "GCS"},
+        ]
+
+    def test_credentials_are_reused_until_key_file_changes(self, tmp_path, monkeypatch):
+        key_file = tmp_path / "sa.json"
+        key_file.write_text("{}")
+        monkeypatch.setenv("GOOGLE_APPLICATION_CREDENTIALS", str(key_file))
+        built = []
+        monkeypatch.setattr(
+            gcp_billing, "_load_credentials", lambda: built.append(1) or object()
+        )
+        gcp_billing._cached_credentials.cache_clear()
+
+        first = gcp_billing._get_credentials()
+        assert gcp_billing._get_credentials() is first
+        assert len(built) == 1
+
+        stat = key_file.stat()
+        os.utime(key_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert gcp_billing._get_credentials() is not first
+        assert len(built) == 2
+        gcp_billing._cached_credentials.cache_clear()
+
+
+class TestTokenCache:
+    def test_valid_token_is_served_until_skewed_expiry(self):
+        cache = TokenCache(skew_s=60)
+        assert cache.get_valid_token() is None
+        cache.set_token("tok", time.time() + 120)
+        assert cache.get_valid_token() == "tok"
+        cache.set_token("tok", time.time() + 30)  # inside the skew window
+        assert cache.get_valid_token() is None
+
+    def test_get_or_refresh_fetches_once_across_threads(self):
+        cache = TokenCache()
+        calls = []
+        gate = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            gate.wait(1)
+            return "fresh", time.time() + 3600
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_refresh(fetch)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        gate.set()
+        for t in threads:
+            t.join()
+
+        assert results == ["fresh"] * 8
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_async_refresh_runs_once_off_loop(self, monkeypatch):
+        cache = TokenCache()
+        monkeypatch.setattr(gcp_billing, "_GCP_TOKEN_CACHE", cache)
+        refresh_threads = []
+
+        def refresh():
+            refresh_threads.append(threading.current_thread())
+            time.sleep(0.05)
+            return "async-tok", time.time() + 3600
+
+        monkeypatch.setattr(gcp_billing, "_refresh_gcp_token", refresh)
+        tokens = await asyncio.gather(
+            *(gcp_billing._get_gcp_token_async() for _ in range(10))
+        )
+
+        assert tokens == ["async-tok"] * 10
+        assert len(refresh_threads) == 1
+        assert refresh_threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_async_refresh_failure_is_shared_not_retried(self):
+        cache = TokenCache()
+        calls = []
+
+        def failing():
+            calls.append(1)
+            time.sleep(0.05)
+            raise RuntimeError("oauth down")
+
+        results = await asyncio.gather(
+            *(cache.get_or_refresh_async(failing) for _ in range(5)),
+            return_exceptions=True,
+        )
+        assert len(calls) == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        # The next miss starts a fresh refresh.
+        assert (
+            await cache.get_or_refresh_async(lambda: ("ok", time.time() + 3600)) == "ok"
+        )
+
+
+class TestTokenFileCache:
+    def test_round_trip_is_private_and_scoped_to_source(self, tmp_path):
+        path = str(tmp_path / "opsyield" / "gcp_token.json")
+        expiry = time.time() + 3600
+        gcp_billing._save_token_file(path, "src-a", "tok", expiry)
+
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert gcp_billing._load_token_file(path, "src-a") == ("tok", expiry)
+        assert gcp_billing._load_token_file(path, "src-b") is None
+
+    def test_expired_entry_is_evicted_on_load(self, tmp_path):
+        path = str(tmp_path / "gcp_token.json")
+        gcp_billing._save_token_file(path, "src", "old", time.time() + 10)
+
+        assert gcp_billing._load_token_file(path, "src") is None
+        assert not (tmp_path / "gcp_token.json").exists()
+
+    def test_refresh_prefers_fresh_disk_token(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "gcp_token.json")
+        monkeypatch.setenv("OPSYIELD_GCP_TOKEN_CACHE", path)
+        source = gcp_billing._credentials_fingerprint()
+        gcp_billing._save_token_file(path, source, "from-disk", time.time() + 3600)
+
+        def no_credentials():
+            raise AssertionError("credentials should not be loaded")
+
+        monkeypatch.setattr(gcp_billing, "_get_credentials", no_credentials)
+        assert gcp_billing._refresh_gcp_token()[0] == "from-disk"
+
+    def test_disk_cache_is_opt_in(self, monkeypatch):
+        monkeypatch.delenv("OPSYIELD_GCP_TOKEN_CACHE", raising=False)
+        assert gcp_billing._token_cache_path() is None
+        monkeypatch.setenv("OPSYIELD_GCP_TOKEN_CACHE", "")
+        assert gcp_billing._token_cache_path() is None
+        monkeypatch.setenv("OPSYIELD_GCP_TOKEN_CACHE", "~/tok.json")
+        assert gcp_billing._token_cache_path() == os.path.expanduser("~/tok.json")
+
+
+class TestSharedClients:
+    def test_ce_client_is_reused_per_region(self, monkeypatch):
+        from opsyield.billing import aws as aws_billing
+
+        created = []
+
+        class FakeSession:
+            def __init__(self, region_name):
+                self.region_name = region_name
+
+            def client(self, name):
+                created.append((self.region_name, name))
+                return object()
+
+        monkeypatch.setattr(aws_billing.boto3, "Session", FakeSession)
+        monkeypatch.setattr(aws_billing, "_CE_CLIENTS", {})
+
+        first = aws_billing._get_ce_client("us-east-1")
+        assert aws_billing._get_ce_client("us-east-1") is first
+        assert aws_billing._get_ce_client("eu-west-1") is not first
+        assert created == [("us-east-1", "ce"), ("eu-west-1", "ce")]
+
+    def test_ce_client_follows_credential_env(self, monkeypatch):
+        from opsyield.billing import aws as aws_billing
+
+        class FakeSession:
+            def __init__(self, region_name):
+                pass
+
+            def client(self, name):
+                return object()
+
+        monkeypatch.setattr(aws_billing.boto3, "Session", FakeSession)
+        monkeypatch.setattr(aws_billing, "_CE_CLIENTS", {})
+        monkeypatch.setenv("AWS_PROFILE", "dev")
+
+        dev = aws_billing._get_ce_client("us-east-1")
+        monkeypatch.setenv("AWS_PROFILE", "prod")
+        assert aws_billing._get_ce_client("us-east-1") is not dev
+        monkeypatch.setenv("AWS_PROFILE", "dev")
+        assert aws_billing._get_ce_client("us-east-1") is dev
+
+
+class TestAWSBilling:
+    def test_cost_explorer_pages_are_followed(self, monkeypatch):
+        from opsyield.billing import aws as aws_billing
+
+        def group(service, amount):
+            return {"Keys": [service], "Metrics": {"UnblendedCost": {"Amount": amount}}}
+
+        pages = {
+            None: {
+                "ResultsByTime": [
+                    {
+                        "TimePeriod": {"Start": "2024-01-01"},
+                        "Groups": [group("EC2", "5")],
+                    }
+                ],
+                "NextPageToken": "p2",
+            },
+            "p2": {
+                "ResultsByTime": [
+                    {
+                        "TimePeriod": {"Start": "2024-01-02"},
+                        "Groups": [group("S3", "2")],
+                    }
+                ]
+            },
+        }
+        calls = []
+
+        class FakeCE:
+            def get_cost_and_usage(self, **kwargs):
+                calls.append(kwargs.get("NextPageToken"))
+                return pages[kwargs.get("NextPageToken")]
+
+        monkeypatch.setattr(aws_billing, "_get_ce_client", lambda region: FakeCE())
+        costs = aws_billing.AWSBillingProvider()._get_ce_costs(30)
+
+        assert calls == [None, "p2"]
+        assert [(c.service, c.cost) for c in costs] == [("EC2", 5.0), ("S3", 2.0)]
+
+    @pytest.mark.asyncio
+    async def test_cost_cache_is_keyed_on_profile(self, monkeypatch):
+        from opsyield.billing import aws as aws_billing
+        from opsyield.billing import base as billing_base
+        from opsyield.core.models import NormalizedCost
+        from opsyield.utils.cache import TTLCache
+
+        monkeypatch.setattr(billing_base, "_COST_CACHE", TTLCache(ttl=60))
+        provider = aws_billing.AWSBillingProvider()
+
+        def fetch(days):
+            return [
+                NormalizedCost(
+                    provider="aws",
+                    service=os.environ["AWS_PROFILE"],
+                    region="us-east-1",
+                    resource_id="aggregated",
+                    cost=1.0,
+                    currency="USD",
+                    timestamp=datetime.now(),
+                )
+            ]
+
+        monkeypatch.setattr(provider, "_get_ce_costs", fetch)
+        monkeypatch.setenv("AWS_PROFILE", "dev")
+        assert (await provider.get_costs(7))[0].service == "dev"
+        monkeypatch.setenv("AWS_PROFILE", "prod")
+        assert (await provider.get_costs(7))[0].service == "prod"
+
+
+class TestCostQuery:
+    def test_query_text_is_stable_and_parameterized(self):
+        sql = gcp_billing._cost_query(
+            "my-proj", "billing_export", "gcp_billing_export_v1_*"
+        )
+        assert "@start_date" in sql
+        assert "`my-proj.billing_export.gcp_billing_export_v1_*`" in sql
+        assert (
+            gcp_billing._cost_query(
+                "my-proj", "billing_export", "gcp_billing_export_v1_*"
+            )
+            is sql
+        )
+
+    def test_project_id_cannot_break_out_of_table_name(self):
+        with pytest.raises(ValueError):
+            gcp_billing._cost_query("x`; DROP TABLE t; --", "d", "t")
+        assert (
+            gcp_billing.validate_project_id("example.com:my-proj")
+            == "example.com:my-proj"
+        )
+
+    @pytest.mark.asyncio
+    async def test_query_sends_start_date_parameter(self, monkeypatch):
+        sent = {}
+
+        async def fake_token():
+            return "tok"
+
+        async def fake_run(client, project, payload):
+            sent.update(payload)
+            return {"jobComplete": True}
+
+        monkeypatch.setattr(gcp_billing, "_get_gcp_token_async", fake_token)
+        monkeypatch.setattr(gcp_billing, "_run_bq_query", fake_run)
+        await gcp_billing.GCPBillingProvider(project_id="my-proj")._query_costs(7)
+
+        (param,) = sent["queryParameters"]
+        assert param["name"] == "start_date"
+        assert param["parameterType"] == {"type": "DATE"}
+        assert len(param["parameterValue"]["value"]) == 10  # YYYY-MM-DD
+        assert "@start_date" in sent["query"]
@@ -5,8 +5,9 @@ Covers:
     - Models (NormalizedCost, Resource, AnalysisResult)
     - Logging (get_logger, set_correlation_id, StructuredJSONFormatter, TimedOperation)
     - Aggregation (AggregationEngine)
-    - Utils (retry, safe_get, safe_float, date helpers, chunk_list)
+    - Utils (retry, safe_get, safe_float, date helpers, chunk_list, TTLCache)
     - Snapshot (SnapshotManager)
+    - Analysis (CostAnalyzer, WasteDetector)
 """
 
 import json
@@ -55,6 +56,11 @@ class TestNormalizedCost:
         assert cost.tags["Name"] == "web-server"
         assert cost.environment == "production"
 
+    def test_slotted_without_instance_dict(self):
+        cost = NormalizedCost("aws", "EC2", "us-east-1", "i-1", 1.0, "USD", None)
+        assert not hasattr(cost, "__dict__")
+        assert cost.tags == {}
+
 
 class TestResource:
     def test_create_minimal(self):
@@ -78,6 +84,15 @@ class TestResource:
         assert r.cpu_avg == 45.2
         assert r.cost_30d == 150.0
 
+    def test_slotted_without_instance_dict(self):
+        from dataclasses import asdict
+
+        r = Resource(id="r-1", name="vm", type="vm", provider="gcp")
+        assert not hasattr(r, "__dict__")
+        with pytest.raises(AttributeError):
+            r.not_a_field = 1
+        assert asdict(r)["id"] == "r-1"
+
 
 class TestAnalysisResult:
     def _make_result(self, **kwargs):
@@ -133,6 +148,13 @@ class TestLogging:
         logger = get_logger("opsyield.core.test")
         assert logger.name == "opsyield.core.test"
 
+    def test_get_logger_returns_cached_instance(self):
+        import logging
+
+        logger = get_logger("cached_mod")
+        assert get_logger("cached_mod") is logger
+        assert logger is logging.getLogger("opsyield.cached_mod")
+
     def test_correlation_id_lifecycle(self):
         cid = set_correlation_id("test-123")
         assert cid == "test-123"
@@ -162,12 +184,120 @@ class TestLogging:
         assert data["level"] == "INFO"
         assert "timestamp" in data
 
+    def test_json_formatter_extra_fields(self):
+        import logging
+
+        formatter = StructuredJSONFormatter()
+        record = logging.LogRecord("t", logging.INFO, "", 0, "m", (), None)
+        assert "provider" not in json.loads(formatter.format(record))
+
+        record.provider = "gcp"
+        record.duration_ms = None  # unset extras are omitted
+        data = json.loads(formatter.format(record))
+        assert data["provider"] == "gcp"
+        assert "duration_ms" not in data
+
+    def test_json_formatter_timestamp_matches_record(self):
+        import logging
+        from datetime import datetime, timezone
+
+        formatter = StructuredJSONFormatter()
+        record = logging.LogRecord("t", logging.INFO, "", 0, "m", (), None)
+        record.created = 1700000000.25
+        first = json.loads(formatter.format(record))["timestamp"]
+        record.created = 1700000001.5  # next second refreshes the cached prefix
+        second = json.loads(formatter.format(record))["timestamp"]
+
+        assert first == datetime.fromtimestamp(1700000000.25, timezone.utc).isoformat()
+        assert second == datetime.fromtimestamp(1700000001.5, timezone.utc).isoformat()
+
+    def test_queue_handler_keeps_context_and_traceback(self):
+        import logging
+        import queue
+        import sys
+
+        from opsyield.core.logging import _ContextQueueHandler
+
+        handler = _ContextQueueHandler(queue.SimpleQueue())
+        set_correlation_id("cid-q")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord(
+                "t", logging.ERROR, "", 0, "failed %s", ("x",), sys.exc_info()
+            )
+        prepared = handler.prepare(record)
+        set_correlation_id("other")  # listener thread sees the captured ID
+
+        data = json.loads(StructuredJSONFormatter().format(prepared))
+        assert data["message"] == "failed x"
+        assert data["correlation_id"] == "cid-q"
+        assert "ValueError: boom" in data["exception"]
+        assert prepared.exc_info is None
+
     def test_timed_operation_logs_duration(self):
         logger = get_logger("test_timer")
         with TimedOperation(logger, "test_op") as _:
             time.sleep(0.01)
         # No exception means success
 
+    def test_timed_operation_pins_correlation_id(self):
+        import logging
+
+        records = []
+
+        class Capture(logging.Handler):
+            def emit(self, record):
+                records.append(record)
+
+        logger = get_logger("test_timer_cid")
+        logger.setLevel(logging.INFO)
+        logger.addHandler(Capture())
+        set_correlation_id("op-cid")
+        with TimedOperation(logger, "test_op"):
+            set_correlation_id("changed-inside")
+
+        assert [r.correlation_id for r in records] == ["op-cid", "op-cid"]
+
+    def test_timed_operation_duration_in_ms(self):
+        import logging
+
+        records = []
+
+        class Capture(logging.Handler):
+            def emit(self, record):
+                records.append(record)
+
+        logger = get_logger("test_timer_ns")
+        logger.setLevel(logging.INFO)
+        logger.addHandler(Capture())
+        with TimedOperation(logger, "test_op") as op:
+            time.sleep(0.01)
+
+        assert isinstance(op.start, int)
+        assert 10 <= records[-1].duration_ms < 1000
+
+    def test_timed_operation_skips_info_but_logs_failures(self):
+        import logging
+
+        records = []
+
+        class Capture(logging.Handler):
+            def emit(self, record):
+                records.append(record)
+
+        logger = get_logger("test_timer_quiet")
+        logger.setLevel(logging.WARNING)
+        logger.addHandler(Capture())
+        with TimedOperation(logger, "quiet_op"):
+            pass
+        assert records == []
+
+        with pytest.raises(ValueError), TimedOperation(logger, "bad_op"):
+            raise ValueError("boom")
+        assert [r.getMessage().split(" (")[0] for r in records] == ["Failed: bad_op"]
+        assert records[0].error_type == "ValueError"
+
 
 # ─────────────────────────────────────────────────────────────
 # Aggregation
@@ -230,6 +360,83 @@ class TestAggregationEngine:
         assert result.forecast["predicted_additional_spend"] == 150.0  # 50 + 100
         assert result.forecast["source_forecasts"] == 2
 
+    def test_empty_provider_is_listed_but_skipped(self):
+        engine = AggregationEngine()
+        gcp = self._make_result(
+            "gcp", 100, [Resource(id="1", name="vm", type="vm", provider="gcp")]
+        )
+        gcp.daily_trends = [{"date": "2026-01-01", "amount": 100, "provider": "gcp"}]
+        aws = self._make_result("aws", 0)
+        aws.daily_trends = [{"date": "2026-01-01", "amount": 0, "provider": "aws"}]
+
+        result = engine.merge([gcp, aws])
+
+        assert result.summary["providers"] == ["gcp", "aws"]
+        assert [t["provider"] for t in result.daily_trends] == ["gcp"]
+        assert result.summary["total_cost"] == 100.0
+
+    def test_merge_keeps_order_and_top_k(self):
+        engine = AggregationEngine()
+        r1 = self._make_result("gcp", 100)
+        r1.daily_trends = [
+            {"date": "2026-01-01", "amount": 1, "provider": "gcp"},
+            {"date": "2026-01-03", "amount": 3, "provider": "gcp"},
+        ]
+        r1.cost_drivers = [{"service": f"g{i}", "cost": i} for i in range(30)]
+        r1.high_cost_resources = [{"id": "g-big", "cost_30d": 500}]
+        r1.optimizations = [{"potential_savings": 9}, {"potential_savings": 2}]
+        r2 = self._make_result("aws", 200)
+        r2.daily_trends = [{"date": "2026-01-02", "amount": 2, "provider": "aws"}]
+        r1.anomalies = [{"id": "a1"}]
+        r2.anomalies = [{"id": "a2", "provider": "aws"}]
+        r2.cost_drivers = [{"service": "a-top", "cost": 100}]
+        r2.high_cost_resources = [{"id": "a-mid", "cost_30d": 50}]
+        r2.optimizations = [{"potential_savings": 5}]
+        r1.resource_types = {"vm": 1}
+        r2.resource_types = {"vm": 2, "bucket": 1}
+
+        result = engine.merge([r1, r2])
+
+        assert type(result.resource_types) is dict
+        assert result.resource_types == {"vm": 3, "bucket": 1}
+
+        assert [(t["date"], t["provider"]) for t in result.daily_trends] == [
+            ("2026-01-01", "gcp"),
+            ("2026-01-02", "aws"),
+            ("2026-01-03", "gcp"),
+        ]
+        assert [(a["id"], a["provider"]) for a in result.anomalies] == [
+            ("a1", "gcp"),
+            ("a2", "aws"),
+        ]
+        assert r1.anomalies == [{"id": "a1"}]  # inputs are not tagged in place
+        assert result.anomalies[1] is r2.anomalies[0]
+        assert len(result.cost_drivers) == 20
+        assert result.cost_drivers[0]["service"] == "a-top"
+        assert result.cost_drivers[-1]["cost"] == 11
+        assert [h["id"] for h in result.high_cost_resources] == ["g-big", "a-mid"]
+        assert [o["potential_savings"] for o in result.optimizations] == [9, 5, 2]
+
+    def test_merge_sorts_unordered_inputs(self):
+        engine = AggregationEngine()
+        r1 = self._make_result("gcp", 100)
+        r1.daily_trends = [
+            {"date": "2026-01-03", "amount": 3, "provider": "gcp"},
+            {"date": "2026-01-01", "amount": 1, "provider": "gcp"},
+        ]
+        r1.optimizations = [{"potential_savings": 2}, {"potential_savings": 9}]
+        r2 = self._make_result("aws", 200)
+        r2.optimizations = [{"potential_savings": 1}, {"potential_savings": 5}]
+
+        result = engine.merge([r1, r2])
+
+        dates = [t["date"] for t in result.daily_trends]
+        assert dates == sorted(dates)
+        # r2's default trend row has no provider: tagged on a copy.
+        assert {t["provider"] for t in result.daily_trends} == {"gcp", "aws"}
+        assert "provider" not in r2.daily_trends[0]
+        assert [o["potential_savings"] for o in result.optimizations] == [9, 5, 2, 1]
+
 
 # ─────────────────────────────────────────────────────────────
 # Utils
@@ -244,7 +451,10 @@ from opsyield.utils.helpers import (
     safe_get,
     safe_float,
     safe_round,
+    json_loads,
+    json_dumps,
     chunk_list,
+    ichunk,
 )
 
 
@@ -261,6 +471,17 @@ class TestDateHelpers:
         start, end = date_range_str(30)
         assert len(start) == 10  # YYYY-MM-DD
         assert len(end) == 10
+        assert end == utc_now().strftime("%Y-%m-%d")
+        assert start == days_ago(30).strftime("%Y-%m-%d")
+
+    def test_date_range_str_is_memoized_per_second(self, monkeypatch):
+        from opsyield.utils import helpers
+
+        monkeypatch.setattr(helpers.time, "time", lambda: 1700000000.5)
+        assert date_range_str(7) is date_range_str(7)
+        assert date_range_str(7) == ("2023-11-07", "2023-11-14")
+        monkeypatch.setattr(helpers.time, "time", lambda: 1700000000.0 + 86400)
+        assert date_range_str(7) == ("2023-11-08", "2023-11-15")
 
     def test_iso_now(self):
         result = iso_now()
@@ -280,16 +501,93 @@ class TestSafeAccess:
         data = {"items": [10, 20, 30]}
         assert safe_get(data, "items", 1) == 20
 
+    def test_safe_get_non_containers(self):
+        data = {"name": "vm-1", "items": [10], "n": None}
+        assert safe_get(data, "name", 0, default="d") == "d"
+        assert safe_get(data, "items", "x", default="d") == "d"
+        assert safe_get(data, "items", 5, default="d") == "d"
+        assert safe_get(data, "n", "x", default="d") == "d"
+
     def test_safe_float(self):
         assert safe_float("3.14") == 3.14
         assert safe_float(None, default=-1.0) == -1.0
         assert safe_float("not_a_number") == 0.0
+        assert safe_float(2) == 2.0 and type(safe_float(2)) is float
+        assert safe_float(True) == 1.0
 
     def test_safe_round(self):
         assert safe_round(3.14159, 2) == 3.14
         assert safe_round("bad") == 0.0
 
 
+class TestJSONHelpers:
+    def test_round_trip(self):
+        payload = {"total": 12.5, "services": ["BigQuery", "Cloud Run"], "ok": True}
+        raw = json_dumps(payload)
+        assert isinstance(raw, bytes)
+        assert json_loads(raw) == payload
+        assert json_loads(raw.decode()) == payload
+
+    def test_default_hook_and_stdlib_fallback(self, monkeypatch):
+        from opsyield.utils import helpers
+
+        ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        monkeypatch.setattr(helpers, "HAS_ORJSON", False)
+        assert (
+            json_dumps({"at": ts}, default=str) == b'{"at":"2024-01-01 00:00:00+00:00"}'
+        )
+        assert json_loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+    def test_dumps_str_matches_bytes(self, monkeypatch):
+        from opsyield.utils import helpers
+
+        payload = {"name": "café", "n": [1, 2.5]}
+        for has_orjson in {helpers.HAS_ORJSON, False}:
+            monkeypatch.setattr(helpers, "HAS_ORJSON", has_orjson)
+            text = helpers.json_dumps_str(payload)
+            assert isinstance(text, str)
+            assert text.encode("utf-8") == helpers.json_dumps(payload)
+
+
+class TestDefaultExecutor:
+    @pytest.mark.asyncio
+    async def test_sized_once_per_loop(self, monkeypatch):
+        import asyncio
+        import threading
+
+        from opsyield.utils import helpers
+
+        monkeypatch.setattr(helpers, "_THREAD_POOL_SIZE", 3)
+        monkeypatch.setattr(helpers, "_sized_loops", helpers.weakref.WeakSet())
+
+        helpers.ensure_default_executor()
+        helpers.ensure_default_executor()
+
+        name = await asyncio.to_thread(lambda: threading.current_thread().name)
+        assert name.startswith("opsyield")
+        assert asyncio.get_running_loop() in helpers._sized_loops
+
+    @pytest.mark.asyncio
+    async def test_replaced_executor_is_shut_down(self, monkeypatch):
+        import asyncio
+
+        from opsyield.utils import helpers
+
+        monkeypatch.setattr(helpers, "_sized_loops", helpers.weakref.WeakSet())
+        loop = asyncio.get_running_loop()
+        await asyncio.to_thread(lambda: None)  # creates the stdlib pool
+        stdlib_pool = loop._default_executor  # type: ignore[attr-defined]
+
+        helpers.ensure_default_executor()
+        ours = loop._default_executor  # type: ignore[attr-defined]
+        helpers.ensure_default_executor()
+
+        assert ours is not stdlib_pool
+        assert loop._default_executor is ours  # type: ignore[attr-defined]
+        with pytest.raises(RuntimeError):
+            stdlib_pool.submit(lambda: None)  # shut down, not leaked
+
+
 class TestChunkList:
     def test_basic_chunking(self):
         result = chunk_list([1, 2, 3, 4, 5], 2)
@@ -302,6 +600,12 @@ class TestChunkList:
         result = chunk_list([1, 2, 3, 4], 2)
         assert len(result) == 2
 
+    def test_ichunk_is_lazy_over_any_iterable(self):
+        batches = ichunk(iter(range(5)), 2)
+        assert next(batches) == [0, 1]
+        assert list(batches) == [[2, 3], [4]]
+        assert list(ichunk([], 3)) == []
+
 
 class TestRetry:
     def test_sync_retry_succeeds(self):
@@ -326,6 +630,53 @@ class TestRetry:
         with pytest.raises(RuntimeError, match="boom"):
             always_fail()
 
+    def test_sync_retry_only_listed_exceptions(self):
+        calls = []
+
+        @retry(max_attempts=3, delay_seconds=0, exceptions=(KeyError,))
+        def lookup():
+            calls.append(1)
+            raise ValueError("not retried")
+
+        with pytest.raises(ValueError):
+            lookup()
+        assert len(calls) == 1
+
+        @retry(max_attempts=3, delay_seconds=0, exceptions=(KeyError, ValueError))
+        def lookup_any():
+            calls.append(1)
+            raise ValueError("retried")
+
+        with pytest.raises(ValueError):
+            lookup_any()
+        assert len(calls) == 4
+
+    def test_sync_retry_accepts_bare_exception_class(self):
+        calls = []
+
+        @retry(max_attempts=2, delay_seconds=0, exceptions=ValueError)
+        def flaky():
+            calls.append(1)
+            raise ValueError("retried")
+
+        with pytest.raises(ValueError):
+            flaky()
+        assert len(calls) == 2
+
+    def test_sync_retry_backoff_schedule(self, monkeypatch):
+        from opsyield.utils import helpers
+
+        sleeps = []
+        monkeypatch.setattr(helpers.time, "sleep", sleeps.append)
+
+        @retry(max_attempts=4, delay_seconds=0.5, backoff_factor=3.0)
+        def always_fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            always_fail()
+        assert sleeps == [0.5, 1.5, 4.5]
+
     @pytest.mark.asyncio
     async def test_async_retry_succeeds(self):
         call_count = 0
@@ -342,6 +693,169 @@ class TestRetry:
         assert result == "done"
         assert call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_async_retry_exhausted_and_cancellable(self):
+        import asyncio
+
+        calls = 0
+
+        @retry(max_attempts=3, delay_seconds=0.01)
+        async def always_fail():
+            nonlocal calls
+            calls += 1
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await always_fail()
+        assert calls == 3
+
+        @retry(max_attempts=2, delay_seconds=30)
+        async def fail_then_wait():
+            raise RuntimeError("boom")
+
+        task = asyncio.create_task(fail_then_wait())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+class TestGatherWithLimit:
+    @pytest.mark.asyncio
+    async def test_order_limit_and_exceptions(self):
+        import asyncio
+
+        from opsyield.utils.helpers import gather_with_limit
+
+        running = peak = 0
+
+        async def job(i):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01 * (5 - i))
+            running -= 1
+            if i == 2:
+                raise ValueError("bad")
+            return i
+
+        results = await gather_with_limit([job(i) for i in range(5)], limit=2)
+
+        assert peak == 2
+        assert results[:2] == [0, 1] and results[3:] == [3, 4]
+        assert isinstance(results[2], ValueError)
+        assert await gather_with_limit([], limit=3) == []
+
+    @pytest.mark.asyncio
+    async def test_cancelled_item_is_a_result(self):
+        import asyncio
+
+        from opsyield.utils.helpers import gather_with_limit
+
+        async def cancelled():
+            raise asyncio.CancelledError()
+
+        async def ok():
+            return "ok"
+
+        results = await gather_with_limit([cancelled(), ok(), ok()], limit=1)
+        assert isinstance(results[0], asyncio.CancelledError)
+        assert results[1:] == ["ok", "ok"]
+
+    @pytest.mark.asyncio
+    async def test_contextvars_do_not_leak_between_items(self):
+        from opsyield.utils.helpers import gather_with_limit
+
+        async def first():
+            set_correlation_id("from-first")
+
+        async def second():
+            return get_correlation_id()
+
+        set_correlation_id("outer")
+        results = await gather_with_limit([first(), second()], limit=1)
+        assert results[1] == "outer"
+        assert get_correlation_id() == "outer"
+
+
+from opsyield.utils.cache import TTLCache
+
+
+class TestTTLCache:
+    def test_get_set(self):
+        cache = TTLCache(ttl=60)
+        cache.set("k", 1)
+        assert cache.get("k") == 1
+        assert cache.get("missing", default=0) == 0
+
+    def test_expiry(self):
+        cache = TTLCache(ttl=0.01)
+        cache.set("k", 1)
+        time.sleep(0.02)
+        assert cache.get("k") is None
+
+    def test_maxsize_evicts_oldest(self):
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        assert cache.get("a") is None
+        assert len(cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_coalesces(self):
+        import asyncio
+
+        cache = TTLCache(ttl=60)
+        calls = 0
+
+        async def producer():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return ["row"]
+
+        results = await asyncio.gather(
+            *[cache.get_or_compute("k", producer) for _ in range(5)]
+        )
+        assert results == [["row"]] * 5
+        assert calls == 1
+        assert await cache.get_or_compute("k", producer) == ["row"]
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_skips_rejected(self):
+        cache = TTLCache(ttl=60)
+
+        async def producer():
+            return []
+
+        assert await cache.get_or_compute("k", producer, should_cache=bool) == []
+        assert cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_inflight_is_per_loop(self):
+        import asyncio
+
+        cache = TTLCache(ttl=60)
+
+        async def slow():
+            await asyncio.sleep(0.2)
+            return "main"
+
+        async def other():
+            return "other"
+
+        main = asyncio.create_task(cache.get_or_compute("k", slow))
+        await asyncio.sleep(0)  # main's producer is now in flight
+        # Another loop (e.g. run_sync() in a worker thread) must not await a
+        # task bound to this loop; it runs its own producer.
+        from_thread = await asyncio.to_thread(
+            lambda: asyncio.run(cache.get_or_compute("k", other))
+        )
+        assert from_thread == "other"
+        assert await main == "main"
+
 
 # ─────────────────────────────────────────────────────────────
 # Snapshot
@@ -359,6 +873,18 @@ class TestSnapshotManager:
         loaded = SnapshotManager.load(path)
         assert loaded["summary"]["total_cost"] == 100
 
+    def test_gzip_snapshot_round_trip(self, tmp_path):
+        data = {"summary": {"total_cost": 100}, "rows": [{"service": "EC2"}] * 50}
+        path = str(tmp_path / "snapshot.json.gz")
+
+        SnapshotManager.save(data, path)
+        raw = (tmp_path / "snapshot.json.gz").read_bytes()
+        assert raw[:2] == b"\x1f\x8b"
+        assert SnapshotManager.load(path) == data
+        # Plain snapshots stay human-readable.
+        SnapshotManager.save(data, str(tmp_path / "plain.json"))
+        assert (tmp_path / "plain.json").read_text().startswith("{\n")
+
     def test_compare_no_regression(self):
         baseline = {
             "summary": {"total_cost": 100},
@@ -482,6 +1008,877 @@ class TestOptimizationStrategies:
         assert results[0]["resource_id"] == "i-idle"
 
 
+# ─────────────────────────────────────────────────────────────
+# Analysis (CostAnalyzer, WasteDetector)
+# ─────────────────────────────────────────────────────────────
+
+from datetime import timedelta
+
+from opsyield.analysis.cost_analyzer import CostAnalyzer
+from opsyield.analysis.waste_detector import WasteDetector
+
+
+class TestAnalysis:
+    def test_cost_analyzer_sums_and_ignores_missing(self):
+        resources = [
+            Resource(id="a", name="a", type="vm", provider="gcp", cost_30d=10.5),
+            Resource(id="b", name="b", type="vm", provider="gcp", cost_30d=None),
+            Resource(id="c", name="c", type="vm", provider="gcp", cost_30d=4.5),
+        ]
+        assert CostAnalyzer().calculate(resources) == 15.0
+        assert CostAnalyzer().calculate([]) == 0.0
+
+    def test_waste_detector_runtime_threshold(self):
+        now = datetime.now(timezone.utc)
+        limit = WasteDetector.MAX_RUNTIME_DAYS
+
+        def tmp_vm(name, age):
+            return Resource(
+                id=name,
+                name=name,
+                type="vm",
+                provider="gcp",
+                state="RUNNING",
+                creation_date=now - age,
+            )
+
+        findings = WasteDetector().detect(
+            [
+                tmp_vm("tmp-at-limit", timedelta(days=limit, hours=23)),
+                tmp_vm("tmp-over-limit", timedelta(days=limit + 1, minutes=1)),
+                Resource(
+                    id="prod",
+                    name="prod-api",
+                    type="vm",
+                    provider="gcp",
+                    state="RUNNING",
+                    creation_date=now - timedelta(days=90),
+                ),
+            ]
+        )
+        assert [f["name"] for f in findings] == ["tmp-over-limit"]
+        assert findings[0]["reasons"] == [
+            f"Temporary resource running for {limit + 1} days"
+        ]
+
+    def test_waste_detector_keyword_and_state_matching(self):
+        old = datetime.now(timezone.utc) - timedelta(days=60)
+        findings = WasteDetector().detect(
+            [
+                Resource(
+                    id="1",
+                    name="LoadTestVM",
+                    type="vm",
+                    provider="aws",
+                    state="running",
+                    creation_date=old,
+                ),
+                Resource(
+                    id="2",
+                    name="web",
+                    type="vm",
+                    provider="aws",
+                    state="STOPPED",
+                    cost_30d=12.0,
+                ),
+                Resource(
+                    id="3",
+                    name="web",
+                    type="vm",
+                    provider="aws",
+                    state="stopped",
+                    cost_30d=0.5,
+                ),
+            ]
+        )
+        assert [f["name"] for f in findings] == ["LoadTestVM", "web"]
+
+    def test_waste_detector_accepts_naive_creation_dates(self):
+        naive = datetime.now() - timedelta(days=30)
+        findings = WasteDetector().detect(
+            [
+                Resource(
+                    id="1",
+                    name="tmp-naive",
+                    type="vm",
+                    provider="aws",
+                    creation_date=naive,
+                )
+            ]
+        )
+        assert findings[0]["reasons"] == ["Temporary resource running for 30 days"]
+
+    def test_idle_scorer_keyword_match_is_case_insensitive(self):
+        from opsyield.analysis.idle_scoring import IdleScorer
+
+        scorer = IdleScorer()
+        base = {
+            "type": "vm",
+            "provider": "gcp",
+            "state": "running",
+            "external_ip": "1.2.3.4",
+        }
+        assert scorer.calculate_score(Resource(id="a", name="My-DEV-box", **base)) == 20
+        assert scorer.calculate_score(Resource(id="b", name="prod-api", **base)) == 0
+
+    def test_idle_scorer_heuristics_and_cap(self):
+        from opsyield.analysis.idle_scoring import IdleScorer
+
+        scorer = IdleScorer()
+        stopped = Resource(
+            id="s",
+            name="test-vm",
+            type="vm",
+            provider="gcp",
+            state="STOPPED",
+            cost_30d=3.0,
+        )
+        assert scorer.calculate_score(stopped) == 90  # no-ip + stopped + keyword
+        odd = Resource(
+            id="o",
+            name="test-vm",
+            type="vm",
+            provider="gcp",
+            state="stopping-running",
+            cost_30d=3.0,
+            cpu_avg=0.01,
+        )
+        assert scorer.calculate_score(odd) == 100
+
+    def test_rightsize(self):
+        from opsyield.analysis.rightsizer import Rightsizer, rightsize
+
+        assert rightsize(0.1, "e2-medium") == "e2-small"
+        assert rightsize(0.5, "e2-medium") is None
+        assert rightsize(None, "e2-medium") is None
+        assert rightsize(0.1, "n2-standard-4") is None
+        vm = Resource(
+            id="v",
+            name="v",
+            type="vm",
+            provider="gcp",
+            cpu_avg=0.1,
+            class_type="e2-small",
+        )
+        assert Rightsizer().suggest(vm) == "e2-micro"
+
+    def test_module_functions_match_class_shims(self):
+        from opsyield.analysis import (
+            IdleScorer,
+            RecommendationEngine,
+            build_recommendations,
+            calculate_cost,
+            detect_waste,
+            idle_score,
+        )
+
+        vm = Resource(
+            id="z",
+            name="tmp-vm",
+            type="vm",
+            provider="gcp",
+            state="stopped",
+            cost_30d=5.0,
+            creation_date=datetime.now(timezone.utc) - timedelta(days=30),
+        )
+        assert calculate_cost([vm]) == CostAnalyzer().calculate([vm])
+        assert detect_waste([vm]) == WasteDetector().detect([vm])
+        assert detect_waste([vm], max_runtime_days=60)[0]["reasons"] == [
+            "Stopped but incurring cost ($5.00)"
+        ]
+        assert idle_score(vm) == IdleScorer().calculate_score(vm) == 90
+        assert build_recommendations(
+            90, "e2-small", 7.5
+        ) == RecommendationEngine().build(vm, 90, "e2-small", 7.5)
+
+    def test_orchestrator_single_pass_scan(self):
+        from opsyield.core.orchestrator import Orchestrator
+
+        resources = [
+            Resource(
+                id="idle",
+                name="tmp-worker",
+                type="vm",
+                provider="gcp",
+                state="STOPPED",
+                cost_30d=40.0,
+            ),
+            Resource(
+                id="big",
+                name="api",
+                type="vm",
+                provider="gcp",
+                state="RUNNING",
+                cost_30d=30.0,
+            ),
+            Resource(id="cheap", name="b", type="bucket", provider="gcp", cost_30d=2.0),
+            "not-a-resource",
+        ]
+        scan = Orchestrator._analyze_all(resources)
+
+        assert scan == {
+            "resource_types": {"vm": 2, "bucket": 1},
+            "running_count": 1,
+            "high_cost": [
+                {"id": "idle", "name": "tmp-worker", "type": "vm", "cost_30d": 40.0},
+                {"id": "big", "name": "api", "type": "vm", "cost_30d": 30.0},
+            ],
+        }
+
+
+# ─────────────────────────────────────────────────────────────
+# Orchestrator
+# ─────────────────────────────────────────────────────────────
+
+import threading
+
+from opsyield.core.orchestrator import Orchestrator
+
+
+class _FakeProvider:
+    def __init__(self, costs=None, resources=None):
+        self.costs = costs or []
+        self.resources = resources or []
+
+    async def get_costs(self, days):
+        return self.costs
+
+    async def get_infrastructure(self):
+        return self.resources
+
+
+class TestOrchestrator:
+    @pytest.mark.asyncio
+    async def test_analyze_reduces_off_loop_with_context(self, monkeypatch):
+        from opsyield.providers.factory import ProviderFactory
+
+        day = datetime(2026, 1, 2, tzinfo=timezone.utc)
+        costs = [
+            NormalizedCost(
+                provider="gcp",
+                service="BigQuery",
+                region="global",
+                resource_id="aggregated",
+                cost=2.5,
+                currency="USD",
+                timestamp=day,
+            ),
+            NormalizedCost(
+                provider="gcp",
+                service="Compute",
+                region="global",
+                resource_id="aggregated",
+                cost=7.5,
+                currency="USD",
+                timestamp=day,
+            ),
+        ]
+        monkeypatch.setattr(
+            ProviderFactory, "get_provider", lambda *a, **k: _FakeProvider(costs)
+        )
+        seen = {}
+        orch = Orchestrator()
+        reduce = orch._reduce
+
+        def spy(*args):
+            seen["thread"] = threading.current_thread()
+            seen["cid"] = get_correlation_id()
+            return reduce(*args)
+
+        monkeypatch.setattr(orch, "_reduce", spy)
+        set_correlation_id("cid-123")
+        result = await orch.analyze("gcp", days=7)
+
+        assert seen["thread"] is not threading.main_thread()
+        assert seen["cid"] == "cid-123"
+        assert result.summary["total_cost"] == 10.0
+        assert result.daily_trends == [
+            {"date": "2026-01-02", "amount": 10.0, "provider": "gcp"}
+        ]
+        assert [d["service"] for d in result.cost_drivers] == ["Compute", "BigQuery"]
+
+    @pytest.mark.asyncio
+    async def test_analyze_results_are_cached_per_arguments(self, monkeypatch):
+        from opsyield.providers.factory import ProviderFactory
+
+        runs = []
+        vm = Resource(id="1", name="vm", type="vm", provider="gcp")
+
+        class Provider(_FakeProvider):
+            def __init__(self, name, project_id):
+                super().__init__(resources=[vm] if name == "gcp" else [])
+                self.name, self.project_id = name, project_id
+
+            async def get_costs(self, days):
+                runs.append((self.name, self.project_id, days))
+                return []
+
+        monkeypatch.setattr(
+            ProviderFactory,
+            "get_provider",
+            lambda name, **kwargs: Provider(name, kwargs.get("project_id")),
+        )
+        orch = Orchestrator()
+
+        first = await orch.analyze("gcp", days=7, project_id="p")
+        again = await orch.analyze("gcp", days=7, project_id="p")
+        assert again.resources is first.resources
+        await orch.analyze("gcp", days=14, project_id="p")
+        await orch.analyze("aws", days=7)
+        await orch.analyze("aws", days=7)  # empty result: not cached
+
+        assert runs == [
+            ("gcp", "p", 7),
+            ("gcp", "p", 14),
+            ("aws", None, 7),
+            ("aws", None, 7),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_analyze_cache_key_uses_resolved_project(self, monkeypatch):
+        import asyncio
+
+        from opsyield.core import context
+        from opsyield.core.context import start_request
+        from opsyield.providers.factory import ProviderFactory
+
+        vm = Resource(id="1", name="vm", type="vm", provider="gcp")
+
+        class Provider(_FakeProvider):
+            @property
+            def project_id(self):
+                return context.get_project()
+
+        monkeypatch.setattr(
+            ProviderFactory,
+            "get_provider",
+            lambda name, **kwargs: Provider(resources=[vm]),
+        )
+        orch = Orchestrator()
+
+        monkeypatch.setattr(context, "CURRENT_PROJECT", "proj-a")
+        first = await orch.analyze("gcp", days=7)
+        monkeypatch.setattr(context, "CURRENT_PROJECT", "proj-b")
+        assert await orch.analyze("gcp", days=7) is not first
+
+        # A hit served to a later request carries that request's timestamp.
+        monkeypatch.setattr(context, "CURRENT_PROJECT", "proj-a")
+
+        async def in_request():
+            ts = start_request()
+            return ts, await orch.analyze("gcp", days=7)
+
+        ts, hit = await asyncio.create_task(in_request())  # own context
+        assert hit.meta["generated_at"] == ts
+        assert hit.resources is first.resources
+
+    def test_analysis_result_json_is_adapted(self):
+        from opsyield.api.adapters.analysis_adapter import analysis_result_json
+
+        result = Orchestrator()._reduce("gcp", 7, [], [])
+        data = json.loads(analysis_result_json(result))
+
+        assert data["meta"]["provider"] == "gcp"
+        assert data["trends"] == [] and "daily_trends" not in data
+        assert data["forecast"] == []
+
+    def test_amounts_are_rounded_only_by_the_adapter(self):
+        from opsyield.api.adapters.analysis_adapter import adapt_analysis_result
+
+        day = datetime(2026, 1, 2, tzinfo=timezone.utc)
+        costs = [
+            NormalizedCost("gcp", "GCS", "global", "agg", 1 / 3, "USD", day),
+        ]
+        result = Orchestrator()._reduce("gcp", 7, costs, [])
+        assert result.daily_trends[0]["amount"] == 1 / 3
+        assert result.cost_drivers[0]["cost"] == 1 / 3
+
+        data = adapt_analysis_result(result)
+        assert data["trends"][0]["amount"] == 0.3333
+        assert data["cost_drivers"][0]["cost"] == 0.3333
+
+    def test_request_timestamp_is_stable_within_a_context(self):
+        import contextvars
+
+        from opsyield.core.context import request_timestamp, start_request
+
+        def in_request():
+            ts = start_request()
+            time.sleep(0.001)
+            assert request_timestamp() == ts
+            return ts
+
+        first = contextvars.copy_context().run(in_request)
+        second = contextvars.copy_context().run(in_request)
+        assert first != second
+
+
+class TestProviderFactory:
+    def test_provider_instances_are_pooled_per_kwargs(self, monkeypatch):
+        from opsyield.core import context
+        from opsyield.providers.factory import ProviderFactory
+
+        monkeypatch.setattr(context, "CURRENT_PROJECT", "proj-a")
+        gcp = ProviderFactory.get_provider("gcp", project_id=None, subscription_id="s")
+
+        assert ProviderFactory.get_provider("gcp", project_id=None) is gcp
+        assert ProviderFactory.get_provider("gcp", project_id="other") is not gcp
+        assert gcp.project_id == "proj-a"
+        context.set_project("proj-b")  # pooled instance follows the context
+        assert gcp.project_id == "proj-b"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_status_checks_share_one_run(self, monkeypatch):
+        import asyncio
+
+        from opsyield.providers import factory
+
+        checks = []
+
+        class SlowProvider:
+            async def get_status(self):
+                checks.append(1)
+                await asyncio.sleep(0.05)
+                return {"installed": True, "authenticated": True}
+
+        monkeypatch.setattr(
+            factory.ProviderFactory, "_providers", {"fake": SlowProvider}
+        )
+        monkeypatch.setattr(factory, "_status_cache", {})
+        monkeypatch.setattr(factory, "_status_task", None)
+        monkeypatch.setenv("OPSYIELD_STATUS_CACHE", "")
+
+        results = await asyncio.gather(
+            *(factory.ProviderFactory.get_all_statuses() for _ in range(5))
+        )
+
+        assert len(checks) == 1
+        assert all(r is results[0] for r in results)
+        assert results[0]["fake"]["authenticated"] is True
+
+    @pytest.mark.asyncio
+    async def test_status_cache_expires_on_timer(self, monkeypatch):
+        import asyncio
+
+        from opsyield.providers import factory
+
+        checks = []
+
+        class FakeProvider:
+            async def get_status(self):
+                checks.append(1)
+                return {"installed": True, "authenticated": True}
+
+        monkeypatch.setattr(
+            factory.ProviderFactory, "_providers", {"fake": FakeProvider}
+        )
+        monkeypatch.setattr(factory, "_status_cache", {})
+        monkeypatch.setattr(factory, "_status_task", None)
+        monkeypatch.setattr(factory, "_CACHE_TTL", 0.05)
+        monkeypatch.setenv("OPSYIELD_STATUS_CACHE", "")
+
+        first = await factory.ProviderFactory.get_all_statuses()
+        assert await factory.ProviderFactory.get_all_statuses() is first
+        await asyncio.sleep(0.1)
+        assert factory._status_cache == {}
+        await factory.ProviderFactory.get_all_statuses()
+        assert len(checks) == 2
+
+    def test_no_credentials_skips_status_check(self, tmp_path, monkeypatch):
+        from opsyield.providers import factory
+
+        monkeypatch.setenv("HOME", str(tmp_path))
+        for hints in factory._CREDENTIAL_HINTS.values():
+            for var in hints[1]:
+                monkeypatch.delenv(var, raising=False)
+        monkeypatch.setattr(factory, "_on_cloud_vm", lambda: False)
+
+        skipped = factory._no_credentials_status("aws")
+        assert skipped["authenticated"] is False
+        assert skipped["error"] == "No credentials configured"
+        assert factory._no_credentials_status("kubernetes") is None
+
+        # boto3 without the aws CLI: "installed" matches AWSProvider's check.
+        from opsyield.providers import aws as aws_provider
+
+        monkeypatch.setattr(aws_provider, "which_cached", lambda name: None)
+        monkeypatch.setattr(aws_provider, "_has_boto3", lambda: True)
+        assert factory._no_credentials_status("aws")["installed"] is True
+        assert aws_provider.aws_installed() is True
+        monkeypatch.setattr(aws_provider, "_has_boto3", lambda: False)
+        assert factory._no_credentials_status("aws")["installed"] is False
+
+        (tmp_path / ".aws").mkdir()
+        assert factory._no_credentials_status("aws") is None
+        monkeypatch.setenv("AZURE_CONFIG_DIR", str(tmp_path / "az"))
+        assert factory._no_credentials_status("azure") is None
+
+    @pytest.mark.asyncio
+    async def test_disk_cache_spans_processes(self, tmp_path, monkeypatch):
+        import os
+        import stat
+
+        from opsyield.providers import factory
+
+        checks = []
+
+        class FakeProvider:
+            async def get_status(self):
+                checks.append(1)
+                return {
+                    "installed": True,
+                    "authenticated": True,
+                    "debug": {"account_show": {"stdout": '{"tenantId": "t"}'}},
+                }
+
+        monkeypatch.delenv("OPSYIELD_STATUS_CACHE", raising=False)
+        assert factory._status_cache_path() is None  # opt-in
+
+        path = tmp_path / "opsyield" / "status.sqlite"
+        monkeypatch.setenv("OPSYIELD_STATUS_CACHE", str(path))
+        monkeypatch.setattr(
+            factory.ProviderFactory, "_providers", {"fake": FakeProvider}
+        )
+        monkeypatch.setattr(factory, "_status_cache", {})
+        monkeypatch.setattr(factory, "_status_task", None)
+
+        first = await factory.ProviderFactory.get_all_statuses()
+        # A new process starts with an empty in-memory cache.
+        monkeypatch.setattr(factory, "_status_cache", {})
+        second = await factory.ProviderFactory.get_all_statuses()
+
+        assert len(checks) == 1
+        # Debug output and the env snapshot are not persisted.
+        assert second["fake"] == {"installed": True, "authenticated": True}
+        assert "env" not in second["_meta"] and "env" in first["_meta"]
+        assert not any(b"tenantId" in f.read_bytes() for f in path.parent.iterdir())
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+        monkeypatch.setenv("AWS_PROFILE", "another-profile")
+        monkeypatch.setattr(factory, "_status_cache", {})
+        await factory.ProviderFactory.get_all_statuses()
+        assert len(checks) == 2
+
+
+class TestCliUtils:
+    def test_parse_json_accepts_str_and_bytes(self):
+        from opsyield.providers.cli_utils import parse_json
+
+        assert parse_json('{"Account": "123"}') == {"Account": "123"}
+        assert parse_json(b"[1, 2]") == [1, 2]
+        assert parse_json("not json") is None
+        assert parse_json("") is None
+
+    def test_clean_env_copies_only_to_strip_pager(self, monkeypatch):
+        from opsyield.providers.cli_utils import clean_env
+
+        monkeypatch.delenv("PAGER", raising=False)
+        assert clean_env() is None  # children inherit os.environ directly
+        monkeypatch.setenv("PAGER", "less")
+        env = clean_env()
+        assert "PAGER" not in env and env["PATH"]
+
+    def test_which_is_cached_per_path(self, monkeypatch):
+        from opsyield.providers import cli_utils
+
+        lookups = []
+        monkeypatch.setattr(
+            cli_utils.shutil,
+            "which",
+            lambda b, path=None: lookups.append((b, path)) or f"/bin/{b}",
+        )
+        cli_utils._which.cache_clear()
+        monkeypatch.setenv("PATH", "/a")
+
+        assert cli_utils.which_cached("aws") == "/bin/aws"
+        cli_utils.which_cached("aws")
+        monkeypatch.setenv("PATH", "/a:/b")
+        cli_utils.which_cached("aws")
+
+        assert lookups == [("aws", "/a"), ("aws", "/a:/b")]
+        cli_utils._which.cache_clear()
+
+    @pytest.mark.asyncio
+    async def test_run_cli_async_without_shell(self):
+        import sys
+
+        from opsyield.providers.cli_utils import run_cli_async
+
+        ok = await run_cli_async([sys.executable, "-c", "print('value(x)')"])
+        assert ok["ok"] is True and ok["returncode"] == 0
+        assert ok["stdout"] == "value(x)\n"  # raw; callers strip as needed
+        assert ok["stdout_bytes"].strip() == b"value(x)"
+
+        slow = await run_cli_async(
+            [sys.executable, "-c", "import time; time.sleep(5)"], timeout=0.2
+        )
+        assert slow["ok"] is False and slow["stderr"] == "Command timed out"
+
+        missing = await run_cli_async("definitely-not-a-real-cli --version")
+        assert missing["ok"] is False
+
+    @pytest.mark.asyncio
+    async def test_run_cli_async_caps_stdout(self):
+        import sys
+
+        from opsyield.providers.cli_utils import run_cli_async
+
+        flood = "import sys\nwhile True: sys.stdout.write('x' * 65536)"
+        big = await run_cli_async([sys.executable, "-c", flood], max_bytes=100_000)
+        assert big["truncated"] is True
+        assert big["ok"] is True  # stopped by us, not failed
+        assert len(big["stdout_bytes"]) == 100_000
+
+        small = await run_cli_async([sys.executable, "-c", "print('hi')"])
+        assert small["truncated"] is False and small["stdout"] == "hi\n"
+
+    @pytest.mark.asyncio
+    async def test_run_cli_async_caps_stderr_without_hanging(self):
+        import sys
+
+        from opsyield.providers.cli_utils import run_cli_async
+
+        flood = "import sys\nwhile True: sys.stderr.write('x' * 65536)"
+        big = await run_cli_async(
+            [sys.executable, "-c", flood], timeout=5, max_bytes=100_000
+        )
+        assert big["truncated"] is True and big["ok"] is False
+        assert big["stderr"] != "Command timed out"
+        assert len(big["stderr"]) == 100_000
+
+    def test_iter_json_items(self, monkeypatch):
+        from opsyield.providers import cli_utils
+
+        raw = b'[{"id": "a"}, {"id": "b"}]'
+        assert list(cli_utils.iter_json_items(raw)) == [{"id": "a"}, {"id": "b"}]
+        assert list(cli_utils.iter_json_items(b'{"id": "a"}')) == []
+        assert list(cli_utils.iter_json_items(b"")) == []
+
+        if cli_utils.HAS_IJSON:
+            monkeypatch.setattr(cli_utils, "_STREAM_THRESHOLD", 0)
+            items = cli_utils.iter_json_items(raw)
+            assert list(items) == [{"id": "a"}, {"id": "b"}]
+
+    def test_identity_is_cached_per_profile_env(self, monkeypatch):
+        from opsyield.providers import cli_utils
+
+        calls = []
+
+        def fake_run(cmd, timeout=15, tag="CLI"):
+            calls.append(cmd)
+            return {
+                "ok": True,
+                "stdout": '{"Account": "1"}',
+                "stdout_bytes": b'{"Account": "1"}\n',
+                "stderr": "",
+                "returncode": 0,
+            }
+
+        monkeypatch.setattr(cli_utils, "run_cli", fake_run)
+        monkeypatch.setenv("AWS_PROFILE", "dev")
+        cli_utils.identity_cache.clear()
+
+        first = cli_utils.cached_identity("aws")
+        assert cli_utils.cached_identity("aws") is first
+        assert first["identity"] == {"Account": "1"}
+        monkeypatch.setenv("AWS_PROFILE", "prod")
+        cli_utils.cached_identity("aws")
+
+        assert len(calls) == 2
+        cli_utils.identity_cache.clear()
+
+    def test_failed_identity_is_not_cached(self, monkeypatch):
+        from opsyield.providers import cli_utils
+
+        outcomes = iter([False, True])
+        calls = []
+
+        def fetch(profile, region):
+            calls.append(profile)
+            ok = next(outcomes)
+            return {
+                "ok": ok,
+                "stdout": "",
+                "stderr": "" if ok else "expired",
+                "returncode": 0 if ok else 1,
+                "identity": {"Account": "1"} if ok else None,
+            }
+
+        monkeypatch.delenv("AWS_PROFILE", raising=False)
+        cli_utils.identity_cache.clear()
+
+        assert cli_utils.cached_identity("aws", fetch=fetch)["ok"] is False
+        # e.g. `aws sso login` in between: picked up on the next check.
+        assert cli_utils.cached_identity("aws", fetch=fetch)["ok"] is True
+        assert cli_utils.cached_identity("aws", fetch=fetch)["ok"] is True
+        assert len(calls) == 2
+        cli_utils.identity_cache.clear()
+
+    def test_aws_status_uses_sts_sdk_without_cli(self, monkeypatch):
+        boto3 = pytest.importorskip("boto3")
+        from opsyield.providers import aws as aws_provider
+        from opsyield.providers import cli_utils
+
+        class FakeSTS:
+            def get_caller_identity(self):
+                return {"UserId": "u", "Account": "123", "Arn": "arn:x"}
+
+        sessions = []
+
+        class FakeSession:
+            def __init__(self, profile_name=None, region_name=None):
+                sessions.append(profile_name)
+
+            def client(self, name):
+                assert name == "sts"
+                return FakeSTS()
+
+        def no_cli(*args, **kwargs):
+            raise AssertionError("aws CLI should not be spawned")
+
+        monkeypatch.setattr(boto3, "Session", FakeSession)
+        monkeypatch.setattr(cli_utils, "run_cli", no_cli)
+        cli_utils.identity_cache.clear()
+        aws_provider._sts_client.cache_clear()
+
+        status = aws_provider.AWSProvider().get_status_sync()
+
+        assert status["authenticated"] is True
+        assert status["account"] == "123"
+        assert status["debug"]["via"] == "boto3"
+
+        cli_utils.identity_cache.clear()
+        aws_provider.AWSProvider().get_status_sync()
+        assert len(sessions) == 1  # STS client reused across checks
+        cli_utils.identity_cache.clear()
+        aws_provider._sts_client.cache_clear()
+
+    def test_aws_provider_import_does_not_load_boto3(self):
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, opsyield.providers.factory; "
+            "sys.exit('boto3' in sys.modules)"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    @pytest.mark.asyncio
+    async def test_azure_show_cache_and_list_fallback(self, monkeypatch):
+        import asyncio
+
+        from opsyield.providers import azure as azure_provider
+        from opsyield.providers.cli_utils import identity_cache
+
+        started, cancelled = [], []
+
+        def fake_cli(show_ok):
+            async def run(cmd, timeout=15, tag="CLI"):
+                started.append(cmd[2])
+                try:
+                    await asyncio.sleep(0.01 if "show" in cmd else 0.05)
+                except asyncio.CancelledError:
+                    cancelled.append(cmd[2])
+                    raise
+                if "show" in cmd:
+                    out = b'{"id": "sub-1", "name": "Main"}' if show_ok else b""
+                    ok = show_ok
+                else:
+                    out, ok = b'[{"id": "sub-2", "name": "B", "state": "Enabled"}]', True
+                return {
+                    "ok": ok,
+                    "stdout": out.decode(),
+                    "stdout_bytes": out,
+                    "stderr": "",
+                    "returncode": 0 if ok else 1,
+                    "truncated": False,
+                }
+
+            return run
+
+        monkeypatch.setattr(azure_provider, "which_cached", lambda b: "/bin/az")
+        identity_cache.clear()
+
+        # Successful show: the overlapped list is cancelled, and the show
+        # result is reused without starting either command again.
+        monkeypatch.setattr(azure_provider, "run_cli_async", fake_cli(True))
+        status = await azure_provider.AzureProvider().get_status()
+        await asyncio.sleep(0)
+        assert sorted(started) == ["list", "show"] and cancelled == ["list"]
+        assert status["subscriptions"] == [{"id": "sub-1", "name": "Main"}]
+        started.clear()
+        status = await azure_provider.AzureProvider().get_status()
+        assert started == []
+        assert status["subscriptions"] == [{"id": "sub-1", "name": "Main"}]
+
+        # Failed show is not cached; the already-running list answers.
+        cancelled.clear()
+        identity_cache.clear()
+        monkeypatch.setattr(azure_provider, "run_cli_async", fake_cli(False))
+        status = await azure_provider.AzureProvider().get_status()
+        assert sorted(started) == ["list", "show"] and cancelled == []
+        assert status["authenticated"] is True
+        assert status["subscriptions"] == [{"id": "sub-2", "name": "B"}]
+        assert len(identity_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_azure_truncated_account_list_authenticates(self, monkeypatch):
+        import sys
+
+        from opsyield.providers import azure as azure_provider
+        from opsyield.providers.cli_utils import identity_cache, run_cli_async
+
+        # A huge `az account list`: the JSON array never fits under the cap.
+        flood = (
+            "import sys\n"
+            "sys.stdout.write('[')\n"
+            "while True: sys.stdout.write('{\"id\": \"s\", \"state\": \"Enabled\"},')"
+        )
+
+        async def fake_cli(cmd, timeout=15, tag="CLI"):
+            if "show" in cmd:
+                return await run_cli_async([sys.executable, "-c", "exit(1)"])
+            return await run_cli_async(
+                [sys.executable, "-c", flood], timeout=5, max_bytes=100_000
+            )
+
+        monkeypatch.setattr(azure_provider, "which_cached", lambda b: "/bin/az")
+        identity_cache.clear()
+        monkeypatch.setattr(azure_provider, "run_cli_async", fake_cli)
+
+        status = await azure_provider.AzureProvider().get_status()
+        assert status["debug"]["account_list"]["truncated"] is True
+        assert status["authenticated"] is True
+        assert status["error"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_status_sync_inside_running_loop(self, monkeypatch):
+        from opsyield.providers import azure as azure_provider
+        from opsyield.providers import gcp as gcp_provider
+
+        monkeypatch.setattr(azure_provider, "which_cached", lambda b: None)
+        monkeypatch.setattr(gcp_provider, "which_cached", lambda b: None)
+
+        # Called from a coroutine, as a sync helper inside a handler would be.
+        assert azure_provider.AzureProvider().get_status_sync()["installed"] is False
+        assert gcp_provider.GCPProvider().get_status_sync()["installed"] is False
+
+    @pytest.mark.asyncio
+    async def test_cancelled_run_cli_async_kills_child(self):
+        import asyncio
+        import sys
+
+        from opsyield.providers.cli_utils import run_cli_async
+
+        task = asyncio.create_task(
+            run_cli_async([sys.executable, "-c", "import time; time.sleep(30)"])
+        )
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, 5)
+
+
 # ─────────────────────────────────────────────────────────────
 # Intelligence Analytics
 # ─────────────────────────────────────────────────────────────
@@ -506,6 +1903,11 @@ class TestIntelligenceAnalytics:
         result = engine.forecast_spend(history, days_ahead=30)
         assert "predicted_additional_spend" in result or "predicted_total" in result
 
+    def test_forecast_uses_last_seven_days(self):
+        history = [{"amount": 100.0}] * 3 + [{"amount": 0.1}] * 7
+        result = ForecastEngine().forecast_spend(history, days_ahead=10)
+        assert result["predicted_additional_spend"] == pytest.approx(1.0)
+
     def test_forecast_empty(self):
         engine = ForecastEngine()
         result = engine.forecast_spend([])
@@ -11,9 +11,13 @@ from .helpers import (
     safe_get,
     safe_float,
     safe_round,
+    json_loads,
+    json_dumps,
     chunk_list,
+    ichunk,
     gather_with_limit,
 )
+from .cache import TTLCache
 
 __all__ = [
     "retry",
@@ -24,6 +28,10 @@ __all__ = [
     "safe_get",
     "safe_float",
     "safe_round",
+    "json_loads",
+    "json_dumps",
     "chunk_list",
+    "ichunk",
     "gather_with_limit",
+    "TTLCache",
 ]
@@ -0,0 +1,111 @@
+"""
+OpsYield TTL Cache — In-process result cache with single-flight coalescing.
+
+Usage:
+    from opsyield.utils.cache import TTLCache
+    cache = TTLCache(ttl=600)
+    costs = await cache.get_or_compute(("gcp", project_id, days), fetch)
+
+Features:
+    - Per-entry expiry (monotonic clock)
+    - Thread-safe get/set
+    - Concurrent async callers for the same key share one in-flight producer
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+_InflightKey = Tuple[asyncio.AbstractEventLoop, Hashable]
+
+
+class TTLCache:
+    """
+    Bounded key → value cache where each entry expires `ttl` seconds
+    after it was stored.
+    """
+
+    def __init__(self, ttl: float = 600.0, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        # (loop, key) -> in-flight producer task. Keyed per loop because
+        # asyncio tasks are loop-bound (e.g. run_sync() in a worker thread).
+        self._inflight: Dict[_InflightKey, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expiry, value = entry
+            if time.monotonic() >= expiry:
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key for `ttl` seconds."""
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                self._evict()
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest one if still full. Lock held."""
+        now = time.monotonic()
+        for k in [k for k, (expiry, _) in self._data.items() if expiry <= now]:
+            del self._data[k]
+        if len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        producer: Callable[[], Awaitable[Any]],
+        should_cache: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Return the cached value for key, or run `producer()` to fill it.
+
+        Only the first caller on a miss runs the producer; concurrent callers
+        for the same key on the same event loop await that same in-flight
+        task. A cancelled caller
+        does not cancel the shared task. Results rejected by `should_cache`
+        (e.g. empty results from a failed provider call) are returned but
+        not stored.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        inflight_key = (asyncio.get_running_loop(), key)
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            task = asyncio.ensure_future(producer())
+            self._inflight[inflight_key] = task
+
+            def _on_done(t: asyncio.Future) -> None:
+                if self._inflight.get(inflight_key) is t:
+                    del self._inflight[inflight_key]
+                if t.cancelled() or t.exception() is not None:
+                    return
+                result = t.result()
+                if should_cache is None or should_cache(result):
+                    self.set(key, result)
+
+            task.add_done_callback(_on_done)
+
+        return await asyncio.shield(task)
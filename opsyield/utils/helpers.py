@@ -6,20 +6,54 @@ Common helper functions used across all modules.
 
 import asyncio
 import functools
+import json
+import os
 import time
 import logging
-from typing import Any, Callable, Dict, TypeVar
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
 from datetime import datetime, timedelta, timezone
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 T = TypeVar("T")
 logger = logging.getLogger("opsyield.utils")
 
+_UTC = timezone.utc
+
 
 # ─────────────────────────────────────────────────────────────
 # Retry Decorator (Sync + Async)
 # ─────────────────────────────────────────────────────────────
 
 
+async def _sleep_on(loop: asyncio.AbstractEventLoop, delay: float) -> None:
+    """asyncio.sleep() on an already-resolved loop: one future, one timer."""
+    fut = loop.create_future()
+    handle = loop.call_later(delay, fut.set_result, None)
+    try:
+        await fut
+    finally:
+        handle.cancel()  # cancelled sleep: don't resolve a cancelled future
+
+
 def retry(
     max_attempts: int = 3,
     delay_seconds: float = 1.0,
@@ -36,22 +70,43 @@ def retry(
             ...
     """
 
+    # Backoff schedule is fixed per decoration: waits[i] follows attempt i+1.
+    waits = tuple(
+        delay_seconds * backoff_factor**i for i in range(max(max_attempts - 1, 0))
+    )
+
+    # A lone class matches with one subclass check; a tuple is scanned.
+    # A bare class (exceptions=ValueError) is accepted, as `except` allows.
+    if isinstance(exceptions, type):
+        catch = exceptions
+    else:
+        catch = exceptions[0] if len(exceptions) == 1 else exceptions
+
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            last_exception = None
-            for attempt in range(1, max_attempts + 1):
+            # First attempt outside the loop: the common success path does
+            # no retry bookkeeping at all.
+            try:
+                return await func(*args, **kwargs)
+            except catch as e:
+                last_exception = e
+            loop = asyncio.get_running_loop()
+            for attempt in range(1, max_attempts):
+                wait = waits[attempt - 1]
+                logger.warning(
+                    "Retry %d/%d for %s after %.1fs — %s",
+                    attempt,
+                    max_attempts,
+                    func.__name__,
+                    wait,
+                    last_exception,
+                )
+                await _sleep_on(loop, wait)
                 try:
                     return await func(*args, **kwargs)
-                except exceptions as e:
+                except catch as e:
                     last_exception = e
-                    if attempt < max_attempts:
-                        wait = delay_seconds * (backoff_factor ** (attempt - 1))
-                        logger.warning(
-                            f"Retry {attempt}/{max_attempts} for {func.__name__} "
-                            f"after {wait:.1f}s — {e}"
-                        )
-                        await asyncio.sleep(wait)
             raise last_exception
 
         @functools.wraps(func)
@@ -60,13 +115,17 @@ def retry(
             for attempt in range(1, max_attempts + 1):
                 try:
                     return func(*args, **kwargs)
-                except exceptions as e:
+                except catch as e:
                     last_exception = e
                     if attempt < max_attempts:
-                        wait = delay_seconds * (backoff_factor ** (attempt - 1))
+                        wait = waits[attempt - 1]
                         logger.warning(
-                            f"Retry {attempt}/{max_attempts} for {func.__name__} "
-                            f"after {wait:.1f}s — {e}"
+                            "Retry %d/%d for %s after %.1fs — %s",
+                            attempt,
+                            max_attempts,
+                            func.__name__,
+                            wait,
+                            e,
                         )
                         time.sleep(wait)
             raise last_exception
@@ -85,7 +144,7 @@ def retry(
 
 def utc_now() -> datetime:
     """Return current UTC datetime (timezone-aware)."""
-    return datetime.now(timezone.utc)
+    return datetime.now(_UTC)
 
 
 def days_ago(days: int) -> datetime:
@@ -93,13 +152,22 @@ def days_ago(days: int) -> datetime:
     return utc_now() - timedelta(days=days)
 
 
+@functools.lru_cache(maxsize=16)
+def _date_range(days: int, epoch_second: int) -> tuple:
+    end = datetime.fromtimestamp(epoch_second, _UTC)
+    start = end - timedelta(days=days)
+    # date().isoformat() is YYYY-MM-DD without strftime's format parsing.
+    return start.date().isoformat(), end.date().isoformat()
+
+
 def date_range_str(days: int) -> tuple:
     """
     Return (start_str, end_str) in YYYY-MM-DD format for billing queries.
+
+    Memoized per (days, wall-clock second): callers repeat a handful of
+    windows (7/30/90) within a request, and the dates stay exact.
     """
-    end = utc_now()
-    start = end - timedelta(days=days)
-    return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+    return _date_range(days, int(time.time()))
 
 
 def iso_now() -> str:
@@ -119,22 +187,28 @@ def safe_get(data: Dict, *keys, default: Any = None) -> Any:
     Usage:
         val = safe_get(response, "data", "results", 0, "cost", default=0.0)
     """
+    # __getitem__ raises KeyError/IndexError/TypeError for every miss, so
+    # one try around the loop replaces per-key type checks. Strings are the
+    # one subscriptable leaf that must not be indexed into.
     current = data
-    for key in keys:
-        try:
-            if isinstance(current, dict):
-                current = current[key]
-            elif isinstance(current, (list, tuple)) and isinstance(key, int):
-                current = current[key]
-            else:
+    try:
+        for key in keys:
+            if isinstance(current, str):
                 return default
-        except (KeyError, IndexError, TypeError):
-            return default
+            current = current[key]
+    except (KeyError, IndexError, TypeError):
+        return default
     return current
 
 
 def safe_float(value: Any, default: float = 0.0) -> float:
     """Convert value to float safely, returning default on failure."""
+    # Exact-type fast paths for the common numeric inputs.
+    cls = type(value)
+    if cls is float:
+        return value
+    if cls is int:
+        return float(value)
     try:
         return float(value)
     except (TypeError, ValueError):
@@ -149,6 +223,67 @@ def safe_round(value: Any, decimals: int = 2, default: float = 0.0) -> float:
         return default
 
 
+# ─────────────────────────────────────────────────────────────
+# JSON (orjson when installed, stdlib fallback)
+# ─────────────────────────────────────────────────────────────
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document; pass raw bytes (e.g. resp.content) when possible."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=default)
+    return json.dumps(
+        obj, default=default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def json_dumps_str(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """json_dumps() as str (log lines, MCP tool results), no bytes round trip."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=default).decode("utf-8")
+    return json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":"))
+
+
+# ─────────────────────────────────────────────────────────────
+# Default Thread Pool
+# ─────────────────────────────────────────────────────────────
+
+# Worker threads behind asyncio.to_thread() (SDK calls, blocking CLIs).
+_THREAD_POOL_SIZE = int(os.environ.get("OPSYIELD_THREAD_POOL", "16"))
+_sized_loops: "weakref.WeakSet[asyncio.AbstractEventLoop]" = weakref.WeakSet()
+
+
+def ensure_default_executor() -> None:
+    """
+    Give the running loop a default executor of OPSYIELD_THREAD_POOL
+    workers (default 16), once per loop.
+
+    The stdlib default is min(32, cpu_count + 4), which small containers
+    shrink to a handful of threads — too few when concurrent tool calls
+    each park workers on blocking SDK/CLI I/O. Call at the top of the
+    async entry points, before their first asyncio.to_thread().
+    """
+    loop = asyncio.get_running_loop()
+    if loop in _sized_loops:
+        return
+    _sized_loops.add(loop)
+    # An earlier to_thread() may already have made the stdlib pool; shut it
+    # down (its running jobs still finish) instead of leaking its threads.
+    previous = getattr(loop, "_default_executor", None)
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=_THREAD_POOL_SIZE, thread_name_prefix="opsyield")
+    )
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
 # ─────────────────────────────────────────────────────────────
 # Batch Processing
 # ─────────────────────────────────────────────────────────────
@@ -165,6 +300,19 @@ def chunk_list(items: list, chunk_size: int) -> list:
     return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
 
 
+def ichunk(items: Iterable[T], chunk_size: int) -> Iterator[List[T]]:
+    """
+    Lazy chunk_list() for any iterable: only one chunk is alive at a time,
+    so a large or streamed input is never copied whole.
+
+    Usage:
+        for batch in ichunk(resources, 50):
+            process_batch(batch)
+    """
+    it = iter(items)
+    return iter(lambda: list(islice(it, chunk_size)), [])
+
+
 async def gather_with_limit(coros, limit: int = 5):
     """
     Run coroutines with a concurrency limit.
@@ -174,11 +322,38 @@ async def gather_with_limit(coros, limit: int = 5):
             [fetch(url) for url in urls],
             limit=10,
         )
-    """
-    semaphore = asyncio.Semaphore(limit)
 
-    async def limited(coro):
-        async with semaphore:
-            return await coro
+    Runs `limit` worker tasks that pull coroutines off a shared iterator,
+    so at most `limit` coroutines are in flight. Results come back in input
+    order, exceptions (including a coroutine's own CancelledError) in place
+    of results, as gather's return_exceptions=True. Each coroutine runs as
+    its own task, so contextvars it sets (e.g. set_correlation_id) do not
+    leak into the next coroutine its worker picks up.
+    """
+    coros = list(coros)
+    results: List[Any] = [None] * len(coros)
+    pending = enumerate(coros)
+
+    async def worker():
+        this = asyncio.current_task()
+        for i, coro in pending:
+            task = asyncio.ensure_future(coro)
+            try:
+                results[i] = await task
+            except asyncio.CancelledError as e:
+                if this is not None and this.cancelling():
+                    raise  # the gather itself is being cancelled
+                results[i] = e
+            except Exception as e:  # noqa: BLE001 - returned, as gather does
+                results[i] = e
 
-    return await asyncio.gather(*[limited(c) for c in coros], return_exceptions=True)
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(min(limit, len(coros))):
+                tg.create_task(worker())
+    finally:
+        # Cancelled part-way: close the coroutines no worker started.
+        for _, coro in pending:
+            if asyncio.iscoroutine(coro):
+                coro.close()
+    return results